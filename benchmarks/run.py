@@ -0,0 +1,386 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCHMARKS_DIR.parent
+SRC_DIR = REPO_ROOT / "src"
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+
+sys.path.insert(0, str(SRC_DIR))
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+import synthetic  # noqa: E402
+
+DEFAULT_SCALES = (10_000, 100_000)
+
+
+def measure(func, repeat=5, number=1, setup=None):
+    """Time func() and return min/median/mean per call in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) * 1000 / number)
+    return {
+        "min_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.fmean(samples),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+# Benchmarks
+def bench_config(context):
+    """Config loading and roster validation, with a cold and a warm hash cache"""
+    import config_loader
+
+    cache_dir = context["tmp"] / "validation"
+    cache_dir.mkdir()
+    runs = iter(range(1_000_000))
+
+    def cold_cache():
+        # A cache file that doesn't exist yet forces every roster file to be hashed
+        config_loader._validation_cache = config_loader.ValidationCache(cache_dir / f"{next(runs)}.json")
+
+    results = {
+        "config_manager_cold": measure(config_loader.ConfigManager, setup=cold_cache),
+        "config_manager_warm": measure(config_loader.ConfigManager),
+        "load_config_cached": measure(config_loader.load_config, repeat=5, number=1000),
+    }
+    config_loader._validation_cache = None
+    return results
+
+
+def bench_roster(context):
+    """DataManager.load_pokemon_data on the real roster and synthetic ones"""
+    from config_loader import load_config
+    from data_manager import DataManager
+
+    config = load_config()
+    results = {"real": measure(lambda: DataManager(config).load_pokemon_data())}
+    for size, files in context["rosters"].items():
+        def load(files=files):
+            manager = DataManager({"pokemon_data_files": files})
+            # Synthetic files have no known hash; parsing is what scales with size
+            manager.validate_pokemon_data = lambda gen, file_path: True
+            return manager.load_pokemon_data()
+
+        results[f"synthetic_{size}"] = measure(load)
+        # What a cold validation cache costs for a roster this size
+        results[f"synthetic_{size}_hash"] = measure(
+            lambda files=files: [_sha256(path) for path in files.values()]
+        )
+    return results
+
+
+def _sha256(path):
+    import hashlib
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def bench_sampler(context):
+    """Species sampler build time and cost per draw"""
+    import random
+    from config_loader import load_config
+    from data_manager import DataManager
+    from sampler import SpeciesSampler
+
+    config = load_config()
+    weights = config["rarity_weights"]
+    rosters = {"real": DataManager(config).load_pokemon_data()}
+    for size, files in context["rosters"].items():
+        manager = DataManager({"pokemon_data_files": files})
+        manager.validate_pokemon_data = lambda gen, file_path: True
+        rosters[f"synthetic_{size}"] = manager.load_pokemon_data()
+
+    draws = 100_000
+    results = {}
+    for name, roster in rosters.items():
+        sampler = SpeciesSampler.from_pokemon_data(roster, weights)
+        rng = random.Random(0)
+        result = {
+            "species": len(roster),
+            "build": measure(lambda roster=roster: SpeciesSampler.from_pokemon_data(roster, weights)),
+            "draw_ns": measure(lambda: sampler.draw_indices(draws, rng))["min_ms"] * 1e6 / draws,
+        }
+        try:
+            import numpy as np
+            np_rng = np.random.default_rng(0)
+            result["draw_array_ns"] = measure(
+                lambda: sampler.draw_array(1_000_000, np_rng))["min_ms"] * 1e6 / 1_000_000
+        except ImportError:
+            pass
+        results[name] = result
+    return results
+
+
+def bench_sprites(context):
+    """Sprite decode cost from the smallest to the largest GIF, and loading from the asset cache"""
+    from asset_cache import AssetCache
+    from config_loader import PROJECT_ROOT
+    from sprite_index import SpriteIndex
+    from sprite_loader import decode_gif_frames, decode_sprite
+
+    index = SpriteIndex(PROJECT_ROOT["runtime"] / "assets" / "gifs").build()
+    sprites = sorted(((info.file_size, key, info.path) for key, info in index.items()), key=lambda item: item[0])
+    if not sprites:
+        return {"skipped": "no sprites in assets/gifs"}
+
+    # An even spread by file size, always including the smallest and largest
+    sample = context["decode_sample"]
+    if sample and sample < len(sprites):
+        step = (len(sprites) - 1) / (sample - 1)
+        sprites = [sprites[round(i * step)] for i in range(sample)]
+
+    photo_image = _photo_image_factory()
+    cache = AssetCache(tempfile.mkdtemp(prefix="idlemon-assets-"))
+    timings = []
+    for file_size, (name, is_shiny), path in sprites:
+        decode = measure(lambda path=path: decode_gif_frames(path), repeat=3)
+        decoded = decode_gif_frames(path)
+        # Fill the cache, then time a run that finds the frames already there
+        decode_sprite(path, cache=cache)
+        cached = measure(lambda path=path: decode_sprite(path, cache=cache), repeat=3)
+        entry = {
+            "name": name,
+            "shiny": is_shiny,
+            "bytes": file_size,
+            "frames": len(decoded.frames),
+            "decoded_bytes": decoded.nbytes,
+            "stored_bytes": decoded.stored_nbytes,
+            "decode_ms": decode["min_ms"],
+            "cached_ms": cached["min_ms"],
+        }
+        if photo_image is not None:
+            entry["photo_image_ms"] = measure(
+                lambda decoded=decoded: [photo_image(frame) for frame in decoded.display_frames()], repeat=3)["min_ms"]
+        timings.append(entry)
+
+    shutil.rmtree(cache.cache_dir, ignore_errors=True)
+    decode_ms = [entry["decode_ms"] for entry in timings]
+    cached_ms = [entry["cached_ms"] for entry in timings]
+    return {
+        "sprites_indexed": len(index),
+        "sampled": len(timings),
+        "decode_ms": {
+            "smallest": timings[0],
+            "largest": timings[-1],
+            "median": statistics.median(decode_ms),
+            "mean": statistics.fmean(decode_ms),
+        },
+        "cached_ms": {
+            "median": statistics.median(cached_ms),
+            "mean": statistics.fmean(cached_ms),
+        },
+        "slowest": sorted(timings, key=lambda entry: -entry["decode_ms"])[:5],
+        "photo_image": photo_image is not None,
+        "sprites": timings,
+    }
+
+
+def _photo_image_factory():
+    """ImageTk.PhotoImage if a display is available, else None"""
+    try:
+        import tkinter as tk
+        from PIL import ImageTk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception:
+        return None
+    return ImageTk.PhotoImage
+
+
+def bench_sprite_index(context):
+    """Building the sprite index from a directory scan, real and synthetic"""
+    from config_loader import PROJECT_ROOT
+    from sprite_index import SpriteIndex
+
+    results = {"real": measure(lambda: SpriteIndex(PROJECT_ROOT["runtime"] / "assets" / "gifs").build())}
+    for size, gifs_dir in context["sprite_sets"].items():
+        results[f"synthetic_{size}"] = measure(lambda gifs_dir=gifs_dir: SpriteIndex(gifs_dir).build(), repeat=3)
+    return results
+
+
+def bench_persistence(context):
+    """Latency of saving a shiny (what log_shiny and save_shiny_count cost the caller)"""
+    from persistence import PersistenceStore
+
+    logs_dir = context["tmp"] / "logs"
+    store = PersistenceStore(logs_dir, flush_interval=3600)
+    results = {
+        "record_shiny_us": measure(lambda: store.record_shiny("Gyarados", "Rare"), number=1000)["min_ms"] * 1000,
+        "set_shiny_count_us": measure(lambda: store.set_shiny_count(5), number=1000)["min_ms"] * 1000,
+    }
+
+    def queue_events(count):
+        for _ in range(count):
+            store.log_shiny("Gyarados", "Rare")
+
+    results["flush_1"] = measure(store.flush, setup=lambda: queue_events(1))
+    results["flush_100"] = measure(store.flush, setup=lambda: queue_events(100))
+    results["compact"] = measure(store.compact)
+    store.close()
+    return results
+
+
+def _sandbox(context):
+    """A copy of the app in a temp dir, so startup runs don't touch real progress"""
+    sandbox = context["tmp"] / "app"
+    if sandbox.exists():
+        return sandbox
+    shutil.copytree(SRC_DIR, sandbox / "src", ignore=shutil.ignore_patterns("__pycache__"))
+    if (REPO_ROOT / "config.json").exists():
+        shutil.copy(REPO_ROOT / "config.json", sandbox / "config.json")
+    try:
+        os.symlink(REPO_ROOT / "assets", sandbox / "assets", target_is_directory=True)
+    except OSError:
+        shutil.copytree(REPO_ROOT / "assets", sandbox / "assets")
+    return sandbox
+
+
+def bench_startup(context):
+    """Cold startup: headless daemon to first event, and the window to its first frame"""
+    sandbox = _sandbox(context)
+    results = {}
+
+    def run_daemon():
+        subprocess.run([sys.executable, "src/daemon.py", "-n", "1", "--delay", "0.001"],
+                       cwd=sandbox, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    results["daemon_process"] = measure(run_daemon, repeat=context["startup_runs"])
+
+    report = context["tmp"] / "startup.json"
+    env = dict(os.environ, IDLEMON_STARTUP_REPORT=str(report))
+    runs = []
+    for _ in range(context["startup_runs"]):
+        report.unlink(missing_ok=True)
+        started = time.perf_counter()
+        process = subprocess.run([sys.executable, "src/main.py"], cwd=sandbox, env=env,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=120)
+        wall = time.perf_counter() - started
+        if process.returncode != 0 or not report.exists():
+            results["window"] = {"skipped": (process.stderr.decode(errors="replace").strip().splitlines()
+                                             or ["no display"])[-1]}
+            return results
+        with open(report, "r", encoding="utf-8") as file:
+            runs.append(dict(json.load(file), process_seconds=wall))
+
+    totals = [run["total"] * 1000 for run in runs]
+    results["window"] = {
+        "first_frame_ms": {"min": min(totals), "median": statistics.median(totals)},
+        "phases_ms": {phase: statistics.median(run["phases"][phase] * 1000 for run in runs)
+                      for phase in runs[0]["phases"]},
+    }
+    return results
+
+
+BENCHMARKS = {
+    "config": bench_config,
+    "roster": bench_roster,
+    "sampler": bench_sampler,
+    "sprites": bench_sprites,
+    "sprite_index": bench_sprite_index,
+    "persistence": bench_persistence,
+    "startup": bench_startup,
+}
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, current, path=""):
+    """Print the change in every median_ms/min_ms found in both results"""
+    for key, value in current.items():
+        old = previous.get(key) if isinstance(previous, dict) else None
+        name = f"{path}.{key}" if path else key
+        if isinstance(value, dict):
+            compare(old or {}, value, name)
+        elif key in ("median_ms", "min_ms", "draw_ns", "record_shiny_us") and isinstance(old, (int, float)) and old:
+            print(f"  {name:<60} {old:>10.3f} -> {value:>10.3f}  ({value / old:>5.2f}x)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time IdleMon's hot paths and save the results as JSON")
+    parser.add_argument("benchmarks", nargs="*", metavar="BENCHMARK",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--scales", type=lambda text: [int(size) for size in text.split(",")],
+                        default=list(DEFAULT_SCALES), help="synthetic roster/sprite sizes, e.g. 10000,100000")
+    parser.add_argument("--decode-sample", type=int, default=40,
+                        help="sprites decoded, spread from smallest to largest (0 for all)")
+    parser.add_argument("--startup-runs", type=int, default=3, help="cold starts per startup benchmark")
+    parser.add_argument("--output", default=None, help="results file (default: benchmarks/results/<time>.json)")
+    parser.add_argument("--compare", metavar="PATH", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    selected = args.benchmarks or list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+    with tempfile.TemporaryDirectory(prefix="idlemon-bench-") as tmp:
+        tmp = Path(tmp)
+        context = {
+            "tmp": tmp,
+            "decode_sample": args.decode_sample,
+            "startup_runs": args.startup_runs,
+            "rosters": {},
+            "sprite_sets": {},
+        }
+        if {"roster", "sampler"} & set(selected):
+            for size in args.scales:
+                context["rosters"][size] = synthetic.make_roster(size, tmp / f"roster_{size}")
+        if "sprite_index" in selected:
+            for size in args.scales:
+                print(f"Generating {size:,} synthetic sprites...")
+                context["sprite_sets"][size] = synthetic.make_sprite_set(size, tmp / f"sprites_{size}")
+
+        results = {}
+        for name in selected:
+            print(f"Running {name}...")
+            started = time.perf_counter()
+            results[name] = BENCHMARKS[name](context)
+            print(f"  done in {time.perf_counter() - started:.1f}s")
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "scales": args.scales,
+        "results": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            previous = json.load(file)
+        print(f"\nCompared with {args.compare} ({previous.get('revision')}):")
+        compare(previous.get("results", {}), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
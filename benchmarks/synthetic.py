@@ -0,0 +1,104 @@
+import argparse
+import io
+import os
+import random
+import sys
+from pathlib import Path
+
+# Rarity tiers with roughly the share of the real roster in each
+RARITY_SHARES = {
+    "Very Common": 0.30,
+    "Common": 0.30,
+    "Semi-rare": 0.20,
+    "Rare": 0.15,
+    "Very Rare": 0.05,
+}
+
+
+def species_names(size):
+    """Deterministic, unique species names"""
+    return [f"Synth{index:06d}" for index in range(size)]
+
+
+def make_roster(size, output_dir, generations=5, seed=0):
+    """Write a roster of size species split across generation files
+
+    Returns {generation: path} in the same shape as config["pokemon_data_files"].
+    """
+    rng = random.Random(seed)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tiers = list(RARITY_SHARES)
+    shares = list(RARITY_SHARES.values())
+
+    names = species_names(size)
+    per_gen = -(-size // generations)
+    files = {}
+    for gen in range(1, generations + 1):
+        chunk = names[(gen - 1) * per_gen:gen * per_gen]
+        path = output_dir / f"gen{gen}_pokemon_names.txt"
+        with open(path, "w", encoding="utf-8", newline="\r\n") as file:
+            for name in chunk:
+                file.write(f"{name},{rng.choices(tiers, shares)[0]}\n")
+        files[f"gen{gen}"] = str(path)
+    return files
+
+
+def make_gif(width=64, height=64, frames=4):
+    """Return the bytes of a small animated GIF"""
+    from PIL import Image
+
+    images = []
+    for index in range(frames):
+        image = Image.new("P", (width, height), 0)
+        image.putpalette([0, 0, 0, 255, 0, 0, 0, 255, 0, 0, 0, 255] * 64)
+        # A moving square so frames differ
+        offset = index * (width // (frames * 2))
+        image.paste(1 + index % 3, (offset, offset, offset + width // 2, offset + height // 2))
+        images.append(image)
+    buffer = io.BytesIO()
+    images[0].save(buffer, format="GIF", save_all=True, append_images=images[1:],
+                   duration=80, loop=0, transparency=0, disposal=2)
+    return buffer.getvalue()
+
+
+def make_sprite_set(size, output_dir, generations=5, shiny=False):
+    """Write size sprites laid out like assets/gifs and return the gifs directory
+
+    Every file holds the same small GIF; the set is for measuring how
+    indexing scales with the number of files, not decode cost.
+    """
+    gifs_dir = Path(output_dir) / "gifs"
+    data = make_gif()
+    names = species_names(size)
+    per_gen = -(-size // generations)
+    variants = ("normal", "shiny") if shiny else ("normal",)
+    for gen in range(1, generations + 1):
+        for variant in variants:
+            variant_dir = gifs_dir / f"gen{gen}" / variant
+            variant_dir.mkdir(parents=True, exist_ok=True)
+            for name in names[(gen - 1) * per_gen:gen * per_gen]:
+                with open(variant_dir / f"{name}.gif", "wb") as file:
+                    file.write(data)
+    return gifs_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic IdleMon rosters and sprite sets")
+    parser.add_argument("size", type=int, help="number of species")
+    parser.add_argument("output", help="directory to write into")
+    parser.add_argument("--sprites", action="store_true", help="also write one GIF per species")
+    parser.add_argument("--shiny", action="store_true", help="write shiny sprites as well")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the rarity assignment")
+    args = parser.parse_args(argv)
+
+    files = make_roster(args.size, os.path.join(args.output, "data"), seed=args.seed)
+    print(f"Wrote {args.size:,} species to {len(files)} roster files in {args.output}")
+    if args.sprites:
+        gifs_dir = make_sprite_set(args.size, args.output, shiny=args.shiny)
+        print(f"Wrote sprites to {gifs_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,20 +12,24 @@ added_files = [
     ('assets/images/*.jpg', 'assets/images'),
     ('assets/images/*.ico', 'assets/images'),
     ('assets/images/*.png', 'assets/images'),
-    ('assets/gifs/gen1/normal/*', 'assets/gifs/gen1/normal'),
-    ('assets/gifs/gen1/shiny/*', 'assets/gifs/gen1/shiny'),
-    ('assets/gifs/gen2/normal/*', 'assets/gifs/gen2/normal'),
-    ('assets/gifs/gen2/shiny/*', 'assets/gifs/gen2/shiny'),
-    ('assets/gifs/gen3/normal/*', 'assets/gifs/gen3/normal'),
-    ('assets/gifs/gen3/shiny/*', 'assets/gifs/gen3/shiny'),
-    ('assets/gifs/gen4/normal/*', 'assets/gifs/gen4/normal'),
-    ('assets/gifs/gen4/shiny/*', 'assets/gifs/gen4/shiny'),
-    ('assets/gifs/gen5/normal/*', 'assets/gifs/gen5/normal'),
-    ('assets/gifs/gen5/shiny/*', 'assets/gifs/gen5/shiny'),
     ('assets/data/*', 'assets/data'),
     ('config.json', '.'),
 ]
 
+# Ship the packed sprite bundle (python src/sprite_bundle.py) instead of loose GIFs when it exists
+if os.path.exists('assets/sprites.bundle'):
+    # A bundle older than any GIF would ship without the newer sprites
+    bundle_mtime = os.path.getmtime('assets/sprites.bundle')
+    newer = [gif for gif in Path('assets/gifs').glob('gen*/*/*.gif') if gif.stat().st_mtime > bundle_mtime]
+    if newer:
+        raise SystemExit(f"assets/sprites.bundle is older than {len(newer)} GIFs (e.g. {newer[0]}); "
+                         "rebuild it with python src/sprite_bundle.py")
+    added_files.append(('assets/sprites.bundle', 'assets'))
+else:
+    for gen in range(1, 6):
+        for variant in ('normal', 'shiny'):
+            added_files.append((f'assets/gifs/gen{gen}/{variant}/*', f'assets/gifs/gen{gen}/{variant}'))
+
 a = Analysis(
     ['src/main.py'],
     pathex=[str(PROJECT_ROOT)],
@@ -0,0 +1,191 @@
+import time
+from bisect import bisect_right
+from collections import deque
+from itertools import accumulate
+
+from metrics import render_time
+
+# Frame durations below this are clamped, like browsers do for 0/10 ms GIF delays (ms)
+MIN_FRAME_DURATION = 20
+
+# Window used to measure the achieved frame rate (seconds)
+FPS_WINDOW = 2.0
+
+
+class SpriteAnimation:
+    """One animated sprite drawn into a persistent canvas item"""
+
+    def __init__(self, engine, slot, frames, durations, position, offsets=None):
+        self.engine = engine
+        self.slot = slot
+        self.frames = frames
+        self.position = position
+        # Top-left corner of each (cropped) frame relative to the sprite's centre
+        self.offsets = offsets
+        durations = [max(MIN_FRAME_DURATION, int(d)) for d in durations] or [MIN_FRAME_DURATION]
+        # Cumulative end time (ms) of each frame within one loop
+        self.frame_ends = list(accumulate(durations))
+        self.cycle_ms = self.frame_ends[-1]
+        self.started = time.monotonic()
+        self.paused_at = None
+        self.current_frame = None
+        self._last_position = None
+        self.after_id = None
+
+        self._centre = position(engine.canvas_width, engine.canvas_height)
+        x, y = self._coords(0)
+        self.item = engine.canvas.create_image(x, y, image=frames[0], anchor="center" if offsets is None else "nw",
+                                               tags=(f"sprite_{slot}",))
+
+    def _coords(self, index):
+        x, y = self._centre
+        if self.offsets is None:
+            return x, y
+        dx, dy = self.offsets[index]
+        return x + dx, y + dy
+
+    def _frame_at(self, now):
+        """Return (frame index, loops completed, ms until the frame ends)"""
+        elapsed_ms = (now - self.started) * 1000
+        loops, offset = divmod(elapsed_ms, self.cycle_ms)
+        index = min(bisect_right(self.frame_ends, offset), len(self.frames) - 1)
+        return index, int(loops), self.frame_ends[index] - offset
+
+    def tick(self):
+        self.after_id = None
+        index, loops, remaining_ms = self._frame_at(time.monotonic())
+        position = loops * len(self.frames) + index
+
+        if index != self.current_frame:
+            # Frames whose whole duration passed while we were late are dropped
+            if self.current_frame is not None:
+                skipped = position - self._last_position - 1
+                if skipped > 0:
+                    self.engine.dropped_frames += skipped
+            with render_time.time():
+                self.engine.canvas.itemconfigure(self.item, image=self.frames[index])
+                if self.offsets is not None:
+                    self.engine.canvas.coords(self.item, *self._coords(index))
+            self.engine._record_draw()
+            self.current_frame = index
+            self._last_position = position
+
+        # A still sprite never changes, so it needs no further wakeups
+        if len(self.frames) == 1:
+            return
+        # Wake up exactly when the current frame's duration runs out
+        self.after_id = self.engine.root.after(max(1, int(remaining_ms + 0.5)), self.tick)
+
+    def pause(self):
+        if self.after_id is not None:
+            self.engine.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.paused_at = time.monotonic()
+
+    def resume(self):
+        if self.paused_at is not None:
+            # Shift the clock so playback continues where it stopped
+            self.started += time.monotonic() - self.paused_at
+            self.paused_at = None
+        if self.after_id is None:
+            self.tick()
+
+    def reposition(self, width, height):
+        self._centre = self.position(width, height)
+        self.engine.canvas.coords(self.item, *self._coords(self.current_frame or 0))
+
+    def stop(self):
+        if self.after_id is not None:
+            self.engine.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.engine.canvas.delete(self.item)
+
+
+class AnimationEngine:
+    """Plays sprite animations on a canvas, following each GIF frame's own duration"""
+
+    def __init__(self, root, canvas, scheduler=None):
+        self.root = root
+        self.canvas = canvas
+        self.canvas_width = int(canvas.cget("width"))
+        self.canvas_height = int(canvas.cget("height"))
+        self.visible = True
+        self._animations = {}
+
+        # Drawing statistics
+        self.frames_drawn = 0
+        self.dropped_frames = 0
+        self._draw_times = deque()
+
+        # Track the canvas size from resize events instead of querying it every frame
+        canvas.bind("<Configure>", self._on_configure, add="+")
+        if scheduler is not None:
+            self.visible = not scheduler.hidden
+            scheduler.on_visibility_change(self.set_visible)
+
+    def play(self, slot, frames, durations, position, offsets=None):
+        """Start animating frames in a slot, replacing whatever played there
+
+        position(canvas_width, canvas_height) returns the sprite's centre.
+        Frames cropped from a larger sprite pass offsets: each frame's
+        top-left corner relative to that centre.
+        """
+        self.stop(slot)
+        if not frames:
+            return None
+        animation = SpriteAnimation(self, slot, frames, durations, position, offsets)
+        self._animations[slot] = animation
+        if self.visible:
+            animation.tick()
+        else:
+            animation.paused_at = animation.started
+        return animation
+
+    def stop(self, slot):
+        """Stop and remove the animation in a slot"""
+        animation = self._animations.pop(slot, None)
+        if animation is not None:
+            animation.stop()
+
+    def stop_all(self):
+        for slot in list(self._animations):
+            self.stop(slot)
+
+    def set_visible(self, visible):
+        """Pause every animation while the window is hidden"""
+        if visible == self.visible:
+            return
+        self.visible = visible
+        for animation in self._animations.values():
+            if visible:
+                animation.resume()
+            else:
+                animation.pause()
+
+    def _on_configure(self, event):
+        if event.widget is not self.canvas:
+            return
+        self.canvas_width = event.width
+        self.canvas_height = event.height
+        for animation in self._animations.values():
+            animation.reposition(event.width, event.height)
+
+    def _record_draw(self):
+        now = time.monotonic()
+        self.frames_drawn += 1
+        self._draw_times.append(now)
+        while now - self._draw_times[0] > FPS_WINDOW:
+            self._draw_times.popleft()
+
+    def stats(self):
+        """Return achieved frame rate and frame counters"""
+        times = self._draw_times
+        fps = 0.0
+        if len(times) > 1 and times[-1] > times[0]:
+            fps = (len(times) - 1) / (times[-1] - times[0])
+        return {
+            "animations": len(self._animations),
+            "fps": fps,
+            "frames_drawn": self.frames_drawn,
+            "dropped_frames": self.dropped_frames,
+        }
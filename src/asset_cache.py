@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+from logger import logger
+
+# Entry layout: magic, header length, JSON header, then for every image its
+# RGBA palette (palette mode only) and raw pixel data, back to back
+ENTRY_MAGIC = b"IDLMAST1"
+HEADER = struct.Struct("<8sI")
+
+# Bump to invalidate every entry when a transform's output changes
+CACHE_VERSION = 2
+
+
+def source_digest(source):
+    """SHA-256 of a file path or readable file object (rewound afterwards)"""
+    if hasattr(source, "read"):
+        position = source.tell()
+        digest = hashlib.sha256(source.read()).hexdigest()
+        source.seek(position)
+        return digest
+    with open(source, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+class AssetCache:
+    """On-disk cache of images derived from assets, keyed by source content and transform
+
+    An entry's name is the hash of the source's SHA-256 plus the transform
+    and its parameters, so editing an asset or changing a parameter simply
+    misses and the stale entry ages out. Entries hold raw pixels, which load
+    far faster than decoding and resampling the original. The least recently
+    used entries are deleted once the directory exceeds max_mb.
+    """
+
+    def __init__(self, cache_dir, max_mb=256):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        # name -> size in bytes, built on the first store
+        self._sizes = None
+        self._total = 0
+        self._lock = threading.Lock()
+
+        # Usage counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(digest, transform, **params):
+        """Entry name for a source digest, transform name and transform parameters"""
+        text = json.dumps([CACHE_VERSION, digest, transform, params], sort_keys=True)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.img"
+
+    def load(self, key):
+        """Return (images, meta) stored under key, or None"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            magic, header_length = HEADER.unpack_from(data)
+            if magic != ENTRY_MAGIC:
+                raise ValueError("not a cache entry")
+            header = json.loads(data[HEADER.size:HEADER.size + header_length])
+            offset = HEADER.size + header_length
+            view = memoryview(data)
+            images = []
+            for mode, width, height, length, palette_length in header["images"]:
+                palette = bytes(view[offset:offset + palette_length])
+                offset += palette_length
+                image = Image.frombytes(mode, (width, height), view[offset:offset + length])
+                if palette:
+                    image.putpalette(palette, rawmode="RGBA")
+                images.append(image)
+                offset += length
+        except (ValueError, KeyError, struct.error) as e:
+            logger.log_error(f"Discarding unreadable asset cache entry {path}: {str(e)}")
+            self._remove(key)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Mark as recently used for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return images, header["meta"]
+
+    def store(self, key, images, meta=None):
+        """Save images (and JSON-serialisable meta) under key; failures only cost a rebuild"""
+        blobs = [image.tobytes() for image in images]
+        palettes = [
+            bytes(image.getpalette("RGBA")) if image.mode == "P" else b""
+            for image in images
+        ]
+        header = json.dumps({
+            "images": [
+                [image.mode, image.width, image.height, len(blob), len(palette)]
+                for image, blob, palette in zip(images, blobs, palettes)
+            ],
+            "meta": meta or {},
+        }).encode("utf-8")
+        path = self._path(key)
+        # Unique per thread, as decode workers may store the same entry at once
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "wb") as file:
+                file.write(HEADER.pack(ENTRY_MAGIC, len(header)))
+                file.write(header)
+                for palette, blob in zip(palettes, blobs):
+                    file.write(palette)
+                    file.write(blob)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.log_error(f"Error writing asset cache entry {path}: {str(e)}")
+            return
+        size = HEADER.size + len(header) + sum(len(blob) for blob in blobs) + sum(len(palette) for palette in palettes)
+        with self._lock:
+            sizes = self._scan()
+            self._total += size - sizes.get(key, 0)
+            sizes[key] = size
+        self._trim()
+
+    def derive(self, digest, transform, params, build):
+        """Return the cached (images, meta) for this source and transform, building it on a miss
+
+        build() -> (images, meta) does the actual work.
+        """
+        key = self.key(digest, transform, **params)
+        cached = self.load(key)
+        if cached is not None:
+            return cached
+        images, meta = build()
+        self.store(key, images, meta)
+        return images, meta
+
+    def resize(self, max_mb):
+        """Change the disk budget, deleting entries if it shrank"""
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._trim()
+
+    def _scan(self):
+        """Sizes of the entries on disk (call with the lock held)"""
+        if self._sizes is None:
+            self._sizes = {}
+            if self.cache_dir.is_dir():
+                for path in self.cache_dir.glob("*/*.img"):
+                    try:
+                        self._sizes[path.stem] = path.stat().st_size
+                    except OSError:
+                        pass
+            self._total = sum(self._sizes.values())
+        return self._sizes
+
+    def _trim(self):
+        """Delete least recently used entries until the cache fits max_bytes"""
+        with self._lock:
+            sizes = self._scan()
+            if self._total <= self.max_bytes:
+                return
+            used = []
+            for key in sizes:
+                try:
+                    used.append((os.stat(self._path(key)).st_mtime_ns, key))
+                except OSError:
+                    used.append((0, key))
+            used.sort()
+            for _, key in used:
+                if self._total <= self.max_bytes:
+                    break
+                self._total -= sizes.pop(key)
+                self.evictions += 1
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+
+    def _remove(self, key):
+        with self._lock:
+            if self._sizes is not None:
+                self._total -= self._sizes.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def stats(self):
+        with self._lock:
+            self._scan()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": self._total,
+            }
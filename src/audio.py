@@ -0,0 +1,151 @@
+import queue
+import threading
+from pathlib import Path
+
+from logger import logger
+from metrics import audio_time
+
+# File types decoded when the mixer starts
+SOUND_EXTENSIONS = (".wav", ".ogg")
+
+# Sounds that can play at the same time
+DEFAULT_CHANNELS = 4
+
+
+class AudioManager:
+    """Plays the sounds in assets/sounds on a background thread
+
+    pygame is imported and the mixer opened on the first unmuted play, and
+    every sound is decoded once at that point. Playing only queues a request,
+    so a slow audio device never holds up the encounter loop or the window.
+    Muting releases the mixer; the next unmuted play opens it again.
+    """
+
+    def __init__(self, sound_dir, muted=False, channels=DEFAULT_CHANNELS):
+        self.sound_dir = Path(sound_dir)
+        self.muted = muted
+        self.num_channels = max(1, channels)
+        self.sounds = {}
+        self._pygame = None
+        self._channels = []
+        self._next_channel = 0
+        self._failed = False
+        self._reported_missing = set()
+        self._requests = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        """Whether the mixer is currently open"""
+        return self._pygame is not None
+
+    def play(self, name):
+        """Queue the sound called name (its file name without extension)"""
+        if self.muted:
+            return
+        self._submit(("play", name))
+
+    def set_muted(self, muted):
+        """Mute or unmute; muting closes the mixer and frees the audio device"""
+        self.muted = muted
+        if muted:
+            self._submit(("release", None))
+
+    def toggle_mute(self):
+        self.set_muted(not self.muted)
+        return self.muted
+
+    def shutdown(self):
+        """Close the mixer and stop the audio thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._requests.put(("stop", None))
+        thread.join(timeout=2)
+
+    def _submit(self, request):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audio", daemon=True)
+                self._thread.start()
+        self._requests.put(request)
+
+    # Audio thread
+    def _run(self):
+        while True:
+            action, name = self._requests.get()
+            if action == "play":
+                # Requests queued before a mute are dropped
+                if not self.muted:
+                    self._play(name)
+            elif action == "release":
+                self._release()
+            else:
+                self._release()
+                return
+
+    def _open(self):
+        """Import pygame, open the mixer and decode every sound"""
+        try:
+            import pygame
+
+            pygame.mixer.init()
+            pygame.mixer.set_num_channels(self.num_channels)
+        except Exception as e:
+            # Don't retry on every play when there is no audio device
+            self._failed = True
+            logger.log_error(f"Error initializing audio: {str(e)}")
+            return False
+
+        self._pygame = pygame
+        self._channels = [pygame.mixer.Channel(index) for index in range(self.num_channels)]
+        self.sounds = {}
+        paths = sorted(self.sound_dir.iterdir()) if self.sound_dir.is_dir() else []
+        for path in paths:
+            if path.suffix.lower() not in SOUND_EXTENSIONS:
+                continue
+            try:
+                self.sounds[path.stem] = pygame.mixer.Sound(str(path))
+            except pygame.error as e:
+                logger.log_error(f"Error loading sound {path}: {e}")
+        return True
+
+    def _release(self):
+        if self._pygame is None:
+            return
+        try:
+            self._pygame.mixer.quit()
+        except Exception as e:
+            logger.log_error(f"Error closing audio: {str(e)}")
+        self._pygame = None
+        self._channels = []
+        self.sounds = {}
+
+    def _channel(self):
+        """A free channel, or the longest-playing one when all are busy"""
+        for offset in range(len(self._channels)):
+            index = (self._next_channel + offset) % len(self._channels)
+            if not self._channels[index].get_busy():
+                break
+        else:
+            index = self._next_channel
+        self._next_channel = (index + 1) % len(self._channels)
+        return self._channels[index]
+
+    def _play(self, name):
+        if self._pygame is None and (self._failed or not self._open()):
+            return
+        sound = self.sounds.get(name)
+        if sound is None:
+            # Report each missing sound once rather than on every play
+            if name not in self._reported_missing:
+                self._reported_missing.add(name)
+                logger.log_error(f"Sound not found: {self.sound_dir / name}")
+            return
+        try:
+            with audio_time.time():
+                self._channel().play(sound)
+        except self._pygame.error as e:
+            logger.log_error("Error playing sound", sound=name, error=str(e))
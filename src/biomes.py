@@ -0,0 +1,138 @@
+import heapq
+
+from logger import logger
+from sampler import SpeciesSampler
+
+# Biome using the whole roster and the global rarity weights
+DEFAULT_BIOME = "default"
+
+# Most likely species per biome whose sprites are worth having ready
+WORKING_SET_SIZE = 16
+
+
+def parse_hours(hours):
+    """Check a biome's "hours" entry: None, or [start, end] with both whole hours 0-23"""
+    if hours is None:
+        return None
+    if (not isinstance(hours, (list, tuple)) or len(hours) != 2
+            or not all(isinstance(hour, int) and not isinstance(hour, bool) and 0 <= hour <= 23 for hour in hours)):
+        raise ValueError(f"hours must be [start, end] with whole hours from 0 to 23, not {hours!r}")
+    return tuple(hours)
+
+
+class Biome:
+    """One spawn table: its species, weights and sampler, built once"""
+
+    __slots__ = ("name", "species", "rarity_weights", "sampler", "background", "hours", "working_set")
+
+    def __init__(self, name, species, rarity_weights, sampler, background=None, hours=None):
+        self.name = name
+        self.species = species
+        self.rarity_weights = rarity_weights
+        self.sampler = sampler
+        # Background image path, None to keep the configured one
+        self.background = background
+        # (start, end) local hours during which "auto" picks this biome
+        self.hours = tuple(hours) if hours else None
+        # Species most likely to appear, most likely first
+        top = heapq.nlargest(WORKING_SET_SIZE, range(sampler.size), key=sampler.probabilities.__getitem__)
+        self.working_set = [sampler.species[index] for index in top]
+
+    def active_at(self, hour):
+        """Whether hour (0-23) falls in this biome's hours; ranges may wrap past midnight"""
+        if self.hours is None:
+            return False
+        start, end = self.hours
+        if start <= end:
+            return start <= hour < end
+        return hour >= start or hour < end
+
+
+class BiomeSet:
+    """Every configured spawn table, precomputed so switching is a dict lookup
+
+    Each entry of biomes (config["biomes"]) may set:
+      generations     roster files to draw from, e.g. ["gen4", "gen5"]
+      species         explicit species list (instead of generations)
+      exclude         species to leave out
+      rarity_weights  weights overriding the global ones
+      background      background image shown while the biome is active
+      hours           [start, end) local hours for "biome": "auto"
+    """
+
+    def __init__(self, pokemon_data, biomes, rarity_weights, default_sampler=None):
+        self.pokemon_data = pokemon_data
+        self.rarity_weights = dict(rarity_weights)
+        self.biomes = {}
+
+        if default_sampler is None:
+            default_sampler = SpeciesSampler.from_pokemon_data(pokemon_data, self.rarity_weights)
+        self.biomes[DEFAULT_BIOME] = Biome(DEFAULT_BIOME, default_sampler.species, self.rarity_weights, default_sampler)
+
+        for name, spec in biomes.items():
+            try:
+                self.biomes[name] = self._build(name, spec)
+            except (ValueError, TypeError, KeyError) as e:
+                logger.log_error(f"Skipping biome {name}: {str(e)}")
+
+        self.active = self.biomes[DEFAULT_BIOME]
+
+    def _build(self, name, spec):
+        pokemon_data = self.pokemon_data
+        if "species" in spec:
+            species = [species_name for species_name in spec["species"] if species_name in pokemon_data]
+            unknown = len(spec["species"]) - len(species)
+            if unknown:
+                logger.log_error(f"Biome {name}: {unknown} listed species are not in the roster")
+        elif "generations" in spec:
+            # Compare generation codes rather than labels, one byte per species
+            codes = {
+                code for code, label in enumerate(pokemon_data.generation_labels)
+                if label in spec["generations"]
+            }
+            species = [
+                species_name for species_name, code in zip(pokemon_data.names, pokemon_data.generations)
+                if code in codes
+            ]
+        else:
+            species = list(pokemon_data)
+
+        excluded = set(spec.get("exclude", ()))
+        if excluded:
+            species = [species_name for species_name in species if species_name not in excluded]
+
+        rarity_weights = {**self.rarity_weights, **spec.get("rarity_weights", {})}
+        sampler = SpeciesSampler(
+            species,
+            [rarity_weights.get(pokemon_data[species_name], 0) for species_name in species]
+        )
+        return Biome(name, sampler.species, rarity_weights, sampler, spec.get("background"), parse_hours(spec.get("hours")))
+
+    def __contains__(self, name):
+        return name in self.biomes
+
+    def __len__(self):
+        return len(self.biomes)
+
+    def names(self):
+        return list(self.biomes)
+
+    def get(self, name):
+        return self.biomes[name]
+
+    def switch(self, name):
+        """Make name the active biome and return it (KeyError if unknown)"""
+        self.active = self.biomes[name]
+        return self.active
+
+    def for_hour(self, hour):
+        """Name of the first biome whose hours include hour, else the default"""
+        for biome in self.biomes.values():
+            if biome.active_at(hour):
+                return biome.name
+        return DEFAULT_BIOME
+
+    def next_name(self):
+        """Name of the biome after the active one, wrapping around"""
+        names = self.names()
+        return names[(names.index(self.active.name) + 1) % len(names)]
@@ -1,6 +1,7 @@
 import json
 import os
 import sys
+import threading
 from pathlib import Path
 
 def get_base_path():
@@ -32,6 +33,9 @@ POKEMON_DATA_HASHES = {
     "gen5": "35f7fbd7e12604d46517389f8d1133f06e67d93b3dbe4fc6b894f26b658c0f73"
 }
 
+# Recorded size, mtime and hash of each validated data file
+VALIDATION_CACHE_FILE = "logs/validation_cache.json"
+
 # Default configuration settings
 DEFAULT_CONFIG = {
     # Gameplay settings
@@ -45,10 +49,35 @@ DEFAULT_CONFIG = {
     },
     "shiny_rate": 2000,         # 1 in X chance of shiny
     "mute_audio": False,        # Audio mute state
+    "frame_cache_mb": 64,       # Memory budget for decoded sprite frames (MB)
+    "persistence_flush_interval": 5.0,  # Seconds between background saves
+    "prefetch_depth": 4,        # Upcoming encounters decoded ahead of time
+    "decode_workers": 2,        # Background threads decoding sprites
+    "encounter_log": False,     # Record every encounter to a binary log
+    "encounter_log_max_mb": 16, # Size at which the encounter log rotates (MB)
+    "encounter_log_max_files": 20,  # Rotated encounter logs kept on disk
+    "startup_timing": False,    # Print how long each startup phase took
+    "offline_progress": False,  # Credit encounters for the time the app was closed
+    "offline_progress_max_hours": 72,  # Longest absence credited (hours)
+    "metrics": False,           # Collect timing metrics for the hot paths
+    "metrics_port": 9464,       # Localhost port serving /metrics (0 to disable)
+    "metrics_snapshot_interval": 60,  # Seconds between metrics snapshot files
+    "asset_cache_mb": 256,      # Disk budget for resized backgrounds and decoded sprites (MB)
+    "sprite_scale": 1.0,        # Size of Pokémon sprites relative to their GIFs
+    "biomes": {},               # Named spawn tables (species, weights, background, hours)
+    "biome": "default",         # Active biome, or "auto" to follow the biomes' hours
+    "config_reload_interval": 2.0,  # Seconds between checks of config.json for edits (0 to disable)
+    "turbo": 1,                 # Simulation speed multiplier (1 for normal speed, 0 for as fast as possible)
+    "turbo_render_fps": 10,     # Encounters drawn per second while in turbo
 
     # File paths
     "shiny_count_file": "logs/shiny_count.bin",
     "shinies_encounter_file": "logs/shinies_encountered.txt",
+    "sprite_manifest_file": "logs/sprite_manifest.json",
+    "encounter_log_dir": "logs/encounters",
+    "metrics_snapshot_file": "logs/metrics.json",
+    "asset_cache_dir": "logs/asset_cache",
+    "species_table_file": "logs/species_table.bin",
     "background_image": "assets/images/default_background.jpg",
 
     # Pokemon data files
@@ -61,6 +90,63 @@ DEFAULT_CONFIG = {
     }
 }
 
+class ValidationCache:
+    """Remembers data file hashes so unchanged files are not re-hashed on every start
+
+    Safe to use from several threads (backgrounds are hashed off the Tk thread).
+    """
+
+    def __init__(self, cache_file):
+        self.cache_file = Path(cache_file)
+        self.entries = {}
+        self._lock = threading.Lock()
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as file:
+                self.entries = json.load(file)
+        except (OSError, ValueError):
+            pass
+
+    def sha256(self, file_path):
+        """Return the file's SHA-256, hashing it only if its size or mtime changed"""
+        stat = os.stat(file_path)
+        key = str(file_path)
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha256"]
+
+        import hashlib
+        with open(file_path, "rb") as file:
+            file_hash = hashlib.sha256(file.read()).hexdigest()
+        with self._lock:
+            self.entries[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_hash}
+            self.save()
+        return file_hash
+
+    def save(self):
+        """Write the entries (call with the lock held, so one thread at a time uses the temp file)"""
+        temp_path = f"{self.cache_file}.tmp"
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self.entries, file)
+            os.replace(temp_path, self.cache_file)
+        except OSError as e:
+            # Only costs a re-hash on the next start
+            print(f"Warning: could not save {self.cache_file}: {e}")
+
+_validation_cache = None
+_validation_cache_lock = threading.Lock()
+
+def file_sha256(file_path):
+    """SHA-256 of a data file, reusing the recorded hash while the file is unchanged"""
+    global _validation_cache
+    if _validation_cache is None:
+        with _validation_cache_lock:
+            if _validation_cache is None:
+                _validation_cache = ValidationCache(PROJECT_ROOT['data'] / VALIDATION_CACHE_FILE)
+    return _validation_cache.sha256(file_path)
+
 class ConfigManager:
     def __init__(self, config_file="config.json"):
         self.config_file = str(PROJECT_ROOT['data'] / config_file)
@@ -76,16 +162,12 @@ class ConfigManager:
 
     def validate_pokemon_data(self, file_path):
         """Verify Pokemon data file integrity using SHA-256 hash"""
-        import hashlib
-        
         gen = os.path.basename(file_path).split('_')[0]  # Get generation from filename
         if not os.path.exists(file_path):
             print(f"Error: {file_path} not found. Please ensure all Pokemon data files are present.")
             sys.exit(1)
             
-        with open(file_path, "rb") as file:
-            file_hash = hashlib.sha256(file.read()).hexdigest()
-            
+        file_hash = file_sha256(file_path)
         if file_hash != POKEMON_DATA_HASHES[gen]:
             print(f"Warning: {file_path} may have been modified. Hash verification failed.")
             print(f"Expected hash: {POKEMON_DATA_HASHES[gen]}")
@@ -95,40 +177,131 @@ class ConfigManager:
     def load_config(self):
         # Load user config if exists
         user_config = {}
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, "r") as file:
-                    user_config = json.load(file)
-            except (json.JSONDecodeError, ValueError) as e:
-                print(f"Error loading config file: {e}. Using default settings.")
-        
-        # Merge user config with defaults
-        config = {**DEFAULT_CONFIG, **user_config}
-        
-        # Convert log paths to absolute
-        path_keys = ["shiny_count_file", "shinies_encounter_file"]
-        for key in path_keys:
-            if not os.path.isabs(config[key]):
-                config[key] = str(PROJECT_ROOT['data'] / config[key])
-        
-        # Convert Pokemon data paths to absolute
-        if not os.path.isabs(next(iter(config["pokemon_data_files"].values()))):
-            config["pokemon_data_files"] = {
-                gen: str(PROJECT_ROOT['data'] / path)
-                for gen, path in config["pokemon_data_files"].items()
-            }
-        
+        try:
+            user_config = read_user_config(self.config_file)
+        except ValueError as e:
+            print(f"Error loading config file: {e}. Using default settings.")
+
+        config = build_config(user_config)
+        # Reject at startup what a reload would reject
+        problems = validate_config(config)
+        if problems:
+            print(f"Error in config file: {'; '.join(problems)}. Using default settings.")
+            config = build_config({})
+
         # Verify all Pokemon data files
         for file_path in config["pokemon_data_files"].values():
             self.validate_pokemon_data(file_path)
             
         return config
 
+def read_user_config(config_file):
+    """Settings from config.json (raises ValueError if it is not valid JSON)"""
+    if not os.path.exists(config_file):
+        return {}
+    with open(config_file, "r") as file:
+        user_config = json.load(file)
+    if not isinstance(user_config, dict):
+        raise ValueError("config.json must contain a JSON object")
+    return user_config
+
+def build_config(user_config):
+    """Merge user settings with the defaults and make paths absolute"""
+    # Merge user config with defaults
+    config = {**DEFAULT_CONFIG, **user_config}
+    
+    # Convert log paths to absolute
+    path_keys = ["shiny_count_file", "shinies_encounter_file", "sprite_manifest_file", "encounter_log_dir",
+                 "metrics_snapshot_file", "asset_cache_dir", "species_table_file"]
+    for key in path_keys:
+        if not os.path.isabs(config[key]):
+            config[key] = str(PROJECT_ROOT['data'] / config[key])
+    
+    # Convert Pokemon data paths to absolute
+    if not os.path.isabs(next(iter(config["pokemon_data_files"].values()))):
+        config["pokemon_data_files"] = {
+            gen: str(PROJECT_ROOT['data'] / path)
+            for gen, path in config["pokemon_data_files"].items()
+        }
+    return config
+
+def validate_config(config):
+    """Return a list of problems with config's values (empty if it is usable)"""
+    problems = []
+    for key, default in DEFAULT_CONFIG.items():
+        value = config.get(key)
+        if isinstance(default, bool):
+            valid = isinstance(value, bool)
+        elif isinstance(default, (int, float)):
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        else:
+            valid = isinstance(value, type(default))
+        if not valid:
+            problems.append(f"{key} should be {type(default).__name__}, not {type(value).__name__}")
+    if not problems:
+        if config["shiny_rate"] < 1:
+            problems.append("shiny_rate must be at least 1")
+        if config["encounter_delay"] <= 0:
+            problems.append("encounter_delay must be positive")
+        if config["turbo"] != 0 and config["turbo"] < 1:
+            problems.append("turbo must be 0 (uncapped) or at least 1")
+        if config["turbo_render_fps"] <= 0:
+            problems.append("turbo_render_fps must be positive")
+        problems.extend(_weight_problems(config["rarity_weights"]))
+        if not any(isinstance(weight, (int, float)) and weight > 0 for weight in config["rarity_weights"].values()):
+            problems.append("rarity_weights needs at least one positive weight")
+        if config["sprite_scale"] <= 0:
+            problems.append("sprite_scale must be positive")
+        for key in ("frame_cache_mb", "asset_cache_mb"):
+            if config[key] < 0:
+                problems.append(f"{key} must not be negative")
+        if config["prefetch_depth"] < 1:
+            problems.append("prefetch_depth must be at least 1")
+        for name, spec in config["biomes"].items():
+            problems.extend(f"biome {name}: {problem}" for problem in _biome_problems(spec))
+    return problems
+
+def _weight_problems(rarity_weights, prefix="rarity_weights"):
+    """Problems with spawn weights: each must be a number of at least 0"""
+    return [
+        f"{prefix}[{rarity!r}] must be a number of at least 0, not {weight!r}"
+        for rarity, weight in rarity_weights.items()
+        if not isinstance(weight, (int, float)) or isinstance(weight, bool) or not weight >= 0
+    ]
+
+def _biome_problems(spec):
+    """Problems with the shape of one entry of config["biomes"]"""
+    from biomes import parse_hours
+
+    if not isinstance(spec, dict):
+        return [f"should be dict, not {type(spec).__name__}"]
+    problems = []
+    for key in ("generations", "species", "exclude"):
+        if key in spec and not isinstance(spec[key], list):
+            problems.append(f"{key} should be list, not {type(spec[key]).__name__}")
+    if "rarity_weights" in spec:
+        if isinstance(spec["rarity_weights"], dict):
+            problems.extend(_weight_problems(spec["rarity_weights"]))
+        else:
+            problems.append(f"rarity_weights should be dict, not {type(spec['rarity_weights']).__name__}")
+    if "background" in spec and not isinstance(spec["background"], str):
+        problems.append(f"background should be str, not {type(spec['background']).__name__}")
+    try:
+        parse_hours(spec.get("hours"))
+    except ValueError as e:
+        problems.append(str(e))
+    return problems
+
+# Config shared by every module, loaded on first use
+_config = None
+
 # Helper functions
-def load_config():
-    """Create config manager and return config"""
-    config_manager = ConfigManager()
-    return config_manager.config
+def load_config(reload=False):
+    """Return the config, creating the config manager on first use"""
+    global _config
+    if _config is None or reload:
+        _config = ConfigManager().config
+    return _config
 
 def check_file_exists(file_path):
     """Check if file exists and warn if missing"""
@@ -0,0 +1,70 @@
+import os
+
+from config_loader import PROJECT_ROOT, build_config, read_user_config, validate_config
+from console import console
+from logger import logger
+
+
+class ConfigWatcher:
+    """Notices edits to config.json by polling its size and mtime
+
+    A poll is one stat() call. When the file changed, the new settings are
+    read, merged with the defaults and validated; a valid config is copied
+    into the shared config dict (so every holder of it sees the new values)
+    and on_change(changed_keys) is called. An invalid edit, or one that
+    on_change fails to apply, is logged and the running config is kept.
+    Roster files are not re-hashed here.
+    """
+
+    def __init__(self, config, on_change, config_file=None):
+        self.config = config
+        self.on_change = on_change
+        self.config_file = str(config_file or PROJECT_ROOT['data'] / "config.json")
+        self._signature = self._stat()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self):
+        """Apply config.json if it changed since the last poll; returns the changed keys"""
+        signature = self._stat()
+        if signature == self._signature:
+            return set()
+        self._signature = signature
+
+        try:
+            new_config = build_config(read_user_config(self.config_file))
+        except (OSError, ValueError) as e:
+            self._reject(str(e))
+            return set()
+        problems = validate_config(new_config)
+        if problems:
+            self._reject("; ".join(problems))
+            return set()
+
+        changed = {key for key in new_config if new_config[key] != self.config.get(key)}
+        if not changed:
+            return changed
+        previous = {key: self.config[key] for key in changed if key in self.config}
+        self.config.update(new_config)
+        try:
+            self.on_change(changed)
+        except Exception as e:
+            # Put the old values back so the config matches what is actually running
+            for key in changed:
+                if key in previous:
+                    self.config[key] = previous[key]
+                else:
+                    self.config.pop(key, None)
+            self._reject(f"could not apply it: {str(e)}")
+            return set()
+        return changed
+
+    @staticmethod
+    def _reject(reason):
+        console.say(f"Ignoring config.json change: {reason}")
+        logger.log_error("Ignoring config.json change", reason=reason)
@@ -0,0 +1,112 @@
+import atexit
+import queue
+import sys
+import threading
+import time
+
+# Lines of one kind printed per second before the rest are only counted
+MAX_LINES_PER_SECOND = 20
+
+# Most lines written to the terminal in one go
+WRITE_BATCH = 256
+
+# Seconds close() waits for queued lines to be written
+SHUTDOWN_TIMEOUT = 2.0
+
+_STOP = object()
+
+
+class Console:
+    """Console output written by a background thread, so a slow terminal never stalls the caller
+
+    say() only enqueues. Lines given a kind (such as "encounter") are rate
+    limited: past max_lines_per_second of that kind in one second, they are
+    counted instead and a single summary line is printed for them. Lines
+    without a kind (shinies, warnings) are always printed.
+    """
+
+    def __init__(self, stream=None, max_lines_per_second=MAX_LINES_PER_SECOND):
+        # None writes to whatever sys.stdout is at the time
+        self.stream = stream
+        self.max_lines_per_second = max_lines_per_second
+        self._lines = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        # Rate limiting state, only touched by the writer thread
+        self._second = None
+        self._counts = {}
+        self._suppressed = {}
+
+    def say(self, text, kind=None):
+        """Queue a line for the console"""
+        self._lines.put((text, kind))
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="console-writer", daemon=True)
+                    self._thread.start()
+                    atexit.register(self.close)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                # Wake up once a second to report lines suppressed in a quiet spell
+                batch = [self._lines.get(timeout=1.0)]
+            except queue.Empty:
+                batch = []
+            while len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self._lines.get_nowait())
+                except queue.Empty:
+                    break
+
+            out = []
+            for item in batch:
+                if item is _STOP:
+                    stopping = True
+                    continue
+                text, kind = item
+                self._roll_second(out)
+                if kind is not None:
+                    count = self._counts.get(kind, 0) + 1
+                    self._counts[kind] = count
+                    if count > self.max_lines_per_second:
+                        self._suppressed[kind] = self._suppressed.get(kind, 0) + 1
+                        continue
+                out.append(text)
+            self._roll_second(out, force=stopping)
+            if out:
+                self._write(out)
+
+    def _roll_second(self, out, force=False):
+        """Start a new one-second window, summarising what the last one suppressed"""
+        second = int(time.monotonic())
+        if second == self._second and not force:
+            return
+        self._second = second
+        self._counts.clear()
+        for kind, count in self._suppressed.items():
+            out.append(f"... and {count:,} more {kind} messages")
+        self._suppressed.clear()
+
+    def _write(self, lines):
+        stream = self.stream or sys.stdout
+        try:
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        except (OSError, ValueError, AttributeError, UnicodeError):
+            # No usable console (closed, or none in a windowed build)
+            pass
+
+    def close(self, timeout=SHUTDOWN_TIMEOUT):
+        """Write what is queued, then stop the writer thread"""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._lines.put(_STOP)
+            thread.join(timeout)
+
+
+# Console shared by every module
+console = Console()
@@ -0,0 +1,315 @@
+import argparse
+import asyncio
+import json
+import signal
+import sys
+import time
+
+# Run a hunt without a display, writing one JSON event per line.
+# Only the hunt core is imported: no tkinter, PIL or pygame.
+
+
+class EventWriter:
+    """Writes hunt events as JSON lines, flushed one by one so pipes see them at once"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.closed = False
+
+    def __call__(self, event):
+        if self.closed:
+            return
+        try:
+            self.stream.write(json.dumps(event) + "\n")
+            self.stream.flush()
+        except BrokenPipeError:
+            # The reader went away; keep hunting and stop writing
+            self.closed = True
+
+
+def run(hunt, delay, emit, max_encounters=None, stop_on_shiny=False):
+    """Run encounters every delay seconds on drift-free deadlines until stopped"""
+    from offline import HEARTBEAT_INTERVAL
+
+    stopping = []
+    previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+
+    hunt.start()
+    encounters = 0
+    next_deadline = time.monotonic() + delay
+    # The daemon counts as the app being open for offline progress
+    next_heartbeat = time.monotonic()
+    try:
+        while not stopping and (max_encounters is None or encounters < max_encounters):
+            wait = next_deadline - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            if stopping:
+                break
+
+            hunt.step()
+            encounters += 1
+            if hunt.shiny_found:
+                if stop_on_shiny:
+                    break
+                # Nobody is there to press Continue
+                hunt.start()
+
+            # Ticks missed while the process was suspended are skipped, not bunched up
+            now = time.monotonic()
+            if hunt.store is not None and now >= next_heartbeat:
+                hunt.store.touch()
+                next_heartbeat = now + HEARTBEAT_INTERVAL
+            next_deadline += delay
+            if delay > 0 and next_deadline < now:
+                next_deadline += ((now - next_deadline) // delay + 1) * delay
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        hunt.stop_timer()
+        if hunt.store is not None:
+            hunt.store.touch()
+        emit({
+            "type": "stopped",
+            "hunt": hunt.hunt_id,
+            "encounters": hunt.total_encounters,
+            "elapsed": round(hunt.elapsed(), 3),
+            "total_shiny": hunt.total_shiny_found,
+            "time": time.time(),
+        })
+
+
+def load_hunt_specs(path):
+    """Read hunt definitions, expanding "count" into numbered copies
+
+    Each entry may set name, count, generations (e.g. ["gen1", "gen2"]),
+    rarity_weights or a biome from config.json, shiny_rate, encounter_delay
+    and seed; anything left out comes from config.json.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        entries = json.load(file)
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+        raise ValueError("hunts file must hold a JSON list of objects")
+    specs = []
+    for index, entry in enumerate(entries):
+        name = entry.get("name", f"hunt{index}")
+        count = entry.get("count", 1)
+        if not _is_int(count) or count < 1:
+            raise ValueError(f"Hunt {name}: count must be a whole number of at least 1, not {count!r}")
+        if "seed" in entry and not _is_int(entry["seed"]):
+            raise ValueError(f"Hunt {name}: seed must be a whole number, not {entry['seed']!r}")
+        for copy in range(count):
+            spec = dict(entry, name=name if count == 1 else f"{name}-{copy}")
+            if "seed" in entry:
+                spec["seed"] = entry["seed"] + copy
+            specs.append(spec)
+    return specs
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def build_scheduler(specs, config, emit):
+    """Create a HuntScheduler with one hunt per spec, sharing rosters and samplers
+
+    Raises ValueError naming the first spec that cannot be built.
+    """
+    from hunt_scheduler import HuntScheduler
+
+    rosters = {}
+    samplers = {}
+    biome_sets = {}
+    scheduler = HuntScheduler()
+    names = set()
+    for spec in specs:
+        name = spec["name"]
+        if name in names:
+            raise ValueError(f"Hunt {name}: another hunt has the same name")
+        names.add(name)
+
+    for spec in specs:
+        name = spec["name"]
+        try:
+            delay = spec.get("encounter_delay", config["encounter_delay"])
+            if not isinstance(delay, (int, float)) or isinstance(delay, bool) or delay <= 0:
+                raise ValueError(f"encounter_delay must be a positive number of seconds, not {delay!r}")
+            hunt = _build_hunt(spec, config, rosters, samplers, biome_sets)
+            hunt.subscribe(lambda event, name=name: emit(dict(event, name=name)))
+            scheduler.add(name, hunt, delay, auto_continue=True)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Hunt {name}: {str(e)}") from None
+    return scheduler
+
+
+def _build_hunt(spec, config, rosters, samplers, biome_sets):
+    """Create the Hunt for one spec, reusing the rosters, samplers and biome sets built so far"""
+    import random
+    from biomes import BiomeSet
+    from data_manager import DataManager
+    from hunt import Hunt
+    from sampler import SpeciesSampler
+
+    if "generations" in spec and not isinstance(spec["generations"], list):
+        raise ValueError(f"generations must be a list such as [\"gen1\"], not {spec['generations']!r}")
+    shiny_rate = spec.get("shiny_rate", config["shiny_rate"])
+    if not _is_int(shiny_rate) or shiny_rate < 1:
+        raise ValueError(f"shiny_rate must be a whole number of at least 1, not {shiny_rate!r}")
+    generations = tuple(spec.get("generations", config["pokemon_data_files"]))
+    unknown = [gen for gen in generations if gen not in config["pokemon_data_files"]]
+    if unknown:
+        raise ValueError(f"unknown generations {', '.join(map(str, unknown))}")
+    if generations not in rosters:
+        files = {gen: config["pokemon_data_files"][gen] for gen in generations}
+        rosters[generations] = DataManager({"pokemon_data_files": files}).load_pokemon_data()
+    pokemon_data = rosters[generations]
+
+    if "biome" in spec:
+        if generations not in biome_sets:
+            biome_sets[generations] = BiomeSet(pokemon_data, config["biomes"], config["rarity_weights"])
+        if spec["biome"] not in biome_sets[generations]:
+            raise ValueError(f"unknown biome {spec['biome']}")
+        sampler = biome_sets[generations].get(spec["biome"]).sampler
+    else:
+        weights = spec.get("rarity_weights", config["rarity_weights"])
+        sampler_key = (generations, tuple(sorted(weights.items())))
+        if sampler_key not in samplers:
+            samplers[sampler_key] = SpeciesSampler.from_pokemon_data(pokemon_data, weights)
+        sampler = samplers[sampler_key]
+
+    # Hunts defined in a spec file keep their own shiny counts
+    return Hunt(
+        pokemon_data,
+        sampler,
+        shiny_rate,
+        rng=random.Random(spec.get("seed")),
+        store=None
+    )
+
+
+def run_many(scheduler, max_encounters=None):
+    """Run every hunt on one asyncio loop until stopped"""
+    async def serve():
+        loop = asyncio.get_running_loop()
+        previous_handler = signal.signal(
+            signal.SIGTERM, lambda signum, frame: loop.call_soon_threadsafe(scheduler.close)
+        )
+        try:
+            await scheduler.run(max_encounters)
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    scheduler.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run an IdleMon hunt headlessly, printing JSON lines")
+    parser.add_argument("--delay", type=float, default=None,
+                        help="seconds between encounters (default: encounter_delay from config.json)")
+    parser.add_argument("-n", "--max-encounters", type=int, default=None,
+                        help="stop after this many encounters")
+    parser.add_argument("--stop-on-shiny", action="store_true",
+                        help="exit after the first shiny instead of starting a new hunt")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible hunts")
+    parser.add_argument("-o", "--output", default="-",
+                        help="file or named pipe to write events to (default: stdout)")
+    parser.add_argument("--hunts", metavar="FILE", default=None,
+                        help="JSON list of hunts to run side by side, each with its own settings")
+    parser.add_argument("--biome", default=None,
+                        help="spawn table from config.json's biomes (default: biome from config.json)")
+    args = parser.parse_args(argv)
+
+    # stdout carries only events; warnings and other messages go to stderr
+    stream = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    sys.stdout = sys.stderr
+
+    import random
+    from biomes import BiomeSet
+    from config_loader import load_config
+    from data_manager import DataManager
+    from encounter_log import EncounterLogWriter
+    from hunt import Hunt
+    from metrics import metrics, start_from_config
+    from persistence import get_store
+    from sampler import SpeciesSampler
+
+    config = load_config()
+    emit = EventWriter(stream)
+    start_from_config(config)
+
+    if args.hunts is not None:
+        try:
+            try:
+                scheduler = build_scheduler(load_hunt_specs(args.hunts), config, emit)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Cannot start hunts from {args.hunts}: {str(e)}")
+                return 1
+            print(f"Running {len(scheduler)} hunts")
+            run_many(scheduler, args.max_encounters)
+            for name in scheduler.keys():
+                emit({"type": "stopped", "name": name, **scheduler.status(name), "time": time.time()})
+        finally:
+            metrics.stop()
+            if stream is not sys.__stdout__:
+                stream.close()
+        return 0
+
+    pokemon_data = DataManager(config).load_pokemon_data()
+    if not pokemon_data:
+        print("No Pokémon data available. Exiting.")
+        return 1
+
+    biome = config["biome"] if args.biome is None else args.biome
+    if biome == "default":
+        sampler = SpeciesSampler.from_pokemon_data(pokemon_data, config["rarity_weights"])
+    else:
+        biomes = BiomeSet(pokemon_data, config["biomes"], config["rarity_weights"])
+        if biome == "auto":
+            biome = biomes.for_hour(time.localtime().tm_hour)
+        if biome not in biomes:
+            print(f"Unknown biome: {biome}")
+            return 1
+        sampler = biomes.get(biome).sampler
+
+    # A single hunt saves its shinies with the window's progress
+    store = get_store()
+    hunt = Hunt(
+        pokemon_data,
+        sampler,
+        config["shiny_rate"],
+        rng=random.Random(args.seed),
+        store=store
+    )
+    hunt.subscribe(emit)
+
+    encounter_log = None
+    if config["encounter_log"]:
+        encounter_log = EncounterLogWriter(
+            config["encounter_log_dir"],
+            pokemon_data.keys(),
+            max_file_mb=config["encounter_log_max_mb"],
+            max_files=config["encounter_log_max_files"],
+            flush_interval=config["persistence_flush_interval"]
+        )
+        hunt.subscribe(encounter_log.handle_event)
+
+    delay = config["encounter_delay"] if args.delay is None else args.delay
+    try:
+        run(hunt, delay, emit, args.max_encounters, args.stop_on_shiny)
+    finally:
+        store.close()
+        metrics.stop()
+        if encounter_log is not None:
+            encounter_log.close()
+        if stream is not sys.__stdout__:
+            stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
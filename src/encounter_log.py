@@ -0,0 +1,267 @@
+import argparse
+import json
+import mmap
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+from logger import logger
+
+# File layout: magic, header length, JSON header (species names), then fixed-size records
+LOG_MAGIC = b"IDLMENC1"
+LOG_VERSION = 1
+HEADER = struct.Struct("<8sI")
+# timestamp (unix seconds), species id, hunt id, shiny flag
+RECORD = struct.Struct("<dIIB")
+# The same record as a NumPy dtype
+RECORD_DTYPE = [("timestamp", "<f8"), ("species_id", "<u4"), ("hunt_id", "<u4"), ("shiny", "u1")]
+
+# Buffered bytes that trigger an early background write
+BATCH_BYTES = 64 * 1024
+# Buffered bytes kept at most while the disk is slow; newer records are dropped beyond this
+MAX_BUFFER_BYTES = 4 * 1024 * 1024
+
+
+class EncounterLogWriter:
+    """Batched, size-rotated binary log of every encounter"""
+
+    def __init__(self, log_dir, species, max_file_mb=16, max_files=20, flush_interval=5.0):
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.max_file_bytes = int(max_file_mb * 1024 * 1024)
+        self.max_files = max_files
+        self.flush_interval = flush_interval
+        self.dropped = 0
+
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._file = None
+        self._file_size = 0
+        self._sequence = 0
+        self.set_species(species)
+
+        self._thread = threading.Thread(target=self._run, name="encounter-log", daemon=True)
+        self._thread.start()
+
+    def set_species(self, species):
+        """Use a new species table; the next batch starts a new file whose header lists it"""
+        with self._lock:
+            self.species = list(species)
+            self._species_ids = {name: index for index, name in enumerate(self.species)}
+            self._species_changed = True
+
+    def record(self, pokemon_name, is_shiny, hunt_id, timestamp=None):
+        """Queue one encounter (never blocks on disk I/O)"""
+        with self._lock:
+            if len(self._buffer) >= MAX_BUFFER_BYTES:
+                self._report_dropped(1)
+                return
+            self._buffer += RECORD.pack(
+                time.time() if timestamp is None else timestamp,
+                self._species_ids.get(pokemon_name, 0xFFFFFFFF),
+                hunt_id,
+                1 if is_shiny else 0
+            )
+            full = len(self._buffer) >= BATCH_BYTES
+        if full:
+            self._wake.set()
+
+    def record_many(self, pokemon_names, hunt_id, started, finished):
+        """Queue a batch of non-shiny encounters, timestamped evenly from started to finished"""
+        import numpy as np
+
+        count = len(pokemon_names)
+        records = np.zeros(count, dtype=RECORD_DTYPE)
+        records["timestamp"] = np.linspace(started, finished, count)
+        records["hunt_id"] = hunt_id
+        with self._lock:
+            species_ids = self._species_ids
+            records["species_id"] = np.fromiter(
+                (species_ids.get(name, 0xFFFFFFFF) for name in pokemon_names), dtype="<u4", count=count
+            )
+            room = max(0, (MAX_BUFFER_BYTES - len(self._buffer)) // RECORD.size)
+            if room < count:
+                self._report_dropped(count - room)
+                records = records[:room]
+            self._buffer += records.tobytes()
+            full = len(self._buffer) >= BATCH_BYTES
+        if full:
+            self._wake.set()
+
+    def _report_dropped(self, count):
+        """Count records dropped because the buffer is full (call with the lock held)"""
+        if not self.dropped:
+            logger.log_error("Encounter log buffer full, dropping records", buffered_bytes=len(self._buffer))
+        self.dropped += count
+
+    def handle_event(self, event):
+        """Record the encounter events emitted by a Hunt"""
+        if event["type"] == "encounter":
+            self.record(event["pokemon"], event["shiny"], event["hunt"], event["time"])
+        elif event["type"] == "encounters":
+            self.record_many(event["pokemon"], event["hunt"], event["started"], event["time"])
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _open_new_file(self):
+        if self._file is not None:
+            self._file.close()
+        self._sequence += 1
+        path = self.log_dir / f"encounters-{time.strftime('%Y%m%d-%H%M%S')}-{self._sequence:04d}.bin"
+        header = json.dumps({
+            "version": LOG_VERSION,
+            "created": time.time(),
+            "species": self.species,
+        }, ensure_ascii=False).encode("utf-8")
+        self._file = open(path, "ab")
+        self._file.write(HEADER.pack(LOG_MAGIC, len(header)) + header)
+        self._file_size = HEADER.size + len(header)
+        self._prune_old_files()
+
+    def _prune_old_files(self):
+        files = sorted(self.log_dir.glob("encounters-*.bin"))
+        for old in files[:max(0, len(files) - self.max_files)]:
+            try:
+                old.unlink()
+            except OSError as e:
+                logger.log_error(f"Error removing old encounter log {old}: {str(e)}")
+
+    def flush(self):
+        """Write buffered records, rotating to a new file when the current one is full"""
+        with self._lock:
+            data, self._buffer = self._buffer, bytearray()
+            species_changed, self._species_changed = self._species_changed, False
+        if not data:
+            return
+        with self._io_lock:
+            try:
+                if self._file is None or species_changed or self._file_size + len(data) > self.max_file_bytes:
+                    self._open_new_file()
+                self._file.write(data)
+                self._file.flush()
+                self._file_size += len(data)
+            except OSError as e:
+                logger.log_error(f"Error writing encounter log: {str(e)}")
+
+    def close(self):
+        """Stop the writer thread and write everything still buffered"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+        with self._io_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class EncounterLogFile:
+    """Memory-mapped view of one encounter log file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != LOG_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not an encounter log")
+        header = json.loads(self._mmap[HEADER.size:HEADER.size + header_length].decode("utf-8"))
+        self.species = header["species"]
+        self.created = header["created"]
+        self.data_offset = HEADER.size + header_length
+        # Ignore a partial record left by a crash mid-write
+        self.count = (len(self._mmap) - self.data_offset) // RECORD.size
+
+    def __len__(self):
+        return self.count
+
+    def records(self):
+        """Yield (timestamp, species name, hunt id, is_shiny) without loading the file"""
+        species = self.species
+        view = memoryview(self._mmap)[self.data_offset:self.data_offset + self.count * RECORD.size]
+        try:
+            for timestamp, species_id, hunt_id, shiny in RECORD.iter_unpack(view):
+                name = species[species_id] if species_id < len(species) else None
+                yield timestamp, name, hunt_id, bool(shiny)
+        finally:
+            view.release()
+
+    def to_array(self):
+        """Return the records as a NumPy structured array backed by the file"""
+        import numpy as np
+
+        return np.memmap(self.path, dtype=np.dtype(RECORD_DTYPE), mode="r", offset=self.data_offset, shape=(self.count,))
+
+    def close(self):
+        self._mmap.close()
+
+
+def iter_log_files(log_dir):
+    """Open every encounter log in a directory, oldest first"""
+    for path in sorted(Path(log_dir).glob("encounters-*.bin")):
+        try:
+            yield EncounterLogFile(path)
+        except (OSError, ValueError) as e:
+            logger.log_error(f"Skipping unreadable encounter log {path}: {str(e)}")
+
+
+def iter_encounters(log_dir):
+    """Stream (timestamp, species name, hunt id, is_shiny) across all log files"""
+    for log_file in iter_log_files(log_dir):
+        try:
+            yield from log_file.records()
+        finally:
+            log_file.close()
+
+
+def main(argv=None):
+    from config_loader import load_config
+
+    config = load_config()
+    parser = argparse.ArgumentParser(description="Summarise the IdleMon encounter log")
+    parser.add_argument("log_dir", nargs="?", default=config["encounter_log_dir"],
+                        help="directory holding encounters-*.bin files")
+    parser.add_argument("--top", type=int, default=10, help="number of species to list")
+    args = parser.parse_args(argv)
+
+    counts = {}
+    shinies = {}
+    hunts = set()
+    total = 0
+    first = last = None
+    for timestamp, name, hunt_id, is_shiny in iter_encounters(args.log_dir):
+        total += 1
+        counts[name] = counts.get(name, 0) + 1
+        if is_shiny:
+            shinies[name] = shinies.get(name, 0) + 1
+        hunts.add(hunt_id)
+        first = timestamp if first is None else min(first, timestamp)
+        last = timestamp if last is None else max(last, timestamp)
+
+    if not total:
+        print(f"No encounters logged in {args.log_dir}")
+        return 1
+
+    print(f"{total:,} encounters over {len(hunts)} hunts "
+          f"({time.ctime(first)} to {time.ctime(last)})")
+    print(f"Shinies: {sum(shinies.values())} (1 in {total / max(1, sum(shinies.values())):,.0f})")
+    print(f"\nTop {args.top} species:")
+    for name, count in sorted(counts.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<14} {count:>10,}  {count / total:>7.3%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
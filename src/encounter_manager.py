@@ -1,37 +1,54 @@
 import random
 
 from colorama import Fore, Style
-from data_manager import save_shiny_count
+from console import console
+from data_manager import DataManager
 from logger import logger
+from persistence import get_store
+from sampler import SpeciesSampler
 
 class EncounterManager:
     def __init__(self, config):
         # Load encounter settings
         self.shiny_rate = config["shiny_rate"]
-        self.rarity_weights = config["rarity_weights"]
+        self.rarity_weights = dict(config["rarity_weights"])
+        self.data_manager = DataManager(config)
+
+        # Species sampler, rebuilt only when the roster or weights change
+        self.sampler = None
+        self._sampler_roster = None
 
     def calculate_weights(self, pokemon_data):
         """Convert Pokemon rarities to spawn weights"""
         return [self.rarity_weights.get(rarity, 0) for rarity in pokemon_data.values()]
 
+    def set_rarity_weights(self, rarity_weights):
+        """Update spawn weights, invalidating the sampler if they changed"""
+        if dict(rarity_weights) != self.rarity_weights:
+            self.rarity_weights = dict(rarity_weights)
+            self.sampler = None
+
+    def get_sampler(self, pokemon_data):
+        """Return the species sampler for this roster, building it on first use"""
+        if self.sampler is None or self._sampler_roster is not pokemon_data:
+            self.sampler = SpeciesSampler.from_pokemon_data(pokemon_data, self.rarity_weights)
+            self._sampler_roster = pokemon_data
+        return self.sampler
+
     def shiny_pokemon(self):
         """Check if encounter is shiny, with teaser message chance"""
         shiny_value = random.randint(1, self.shiny_rate)
         if shiny_value == 1:
             return True
         elif random.randint(1, self.shiny_rate // 5) == 1:
-            print(Fore.MAGENTA + "You hear a shiny Pokémon nearby..." + Style.RESET_ALL)
+            console.say(Fore.MAGENTA + "You hear a shiny Pokémon nearby..." + Style.RESET_ALL, kind="shiny nearby")
         return False
 
     def handle_shiny_encounter(self, game_instance, pokemon_name, pokemon_rarity):
         """Process shiny encounter: update counter and log"""
         try:
-            # Update shiny counter
-            game_instance.total_shiny_found += 1
+            # Update shiny counter and shiny log in one write-behind event
+            game_instance.total_shiny_found = get_store().record_shiny(pokemon_name, pokemon_rarity)
             game_instance.shiny_label.config(text=f"Shiny Pokémon Found: {game_instance.total_shiny_found}")
-            save_shiny_count(game_instance.total_shiny_found)
-            
-            # Record encounter
-            logger.log_shiny(pokemon_name, pokemon_rarity)
         except Exception as e:
             logger.log_error(f"Error handling shiny encounter: {str(e)}")
@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+
+
+class FrameCache:
+    """Memory-bounded LRU cache of decoded sprite frames keyed by (species, shiny)"""
+
+    def __init__(self, max_mb=64):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.current_bytes = 0
+        self._entries = OrderedDict()  # key -> (frames, size in bytes)
+        self._lock = threading.Lock()
+
+        # Usage counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return cached frames for key (marking them recently used) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, frames, size):
+        """Store frames for key, evicting least recently used entries to fit the budget"""
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            # Sprites bigger than the whole budget are never cached
+            if size > self.max_bytes:
+                return False
+            self._entries[key] = (frames, size)
+            self.current_bytes += size
+            self._evict()
+            return True
+
+    def resize(self, max_mb):
+        """Change the memory budget, evicting entries if it shrank"""
+        with self._lock:
+            self.max_bytes = int(max_mb * 1024 * 1024)
+            self._evict()
+
+    def clear(self):
+        """Drop all cached frames"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def stats(self):
+        """Return cache usage counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
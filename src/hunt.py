@@ -0,0 +1,222 @@
+import random
+import time
+
+import persistence
+from logger import logger
+from metrics import encounters, sampling_time, shinies
+
+# Default for Hunt's store: the app's progress, opened only when a hunt needs it
+APP_STORE = object()
+
+# Encounters between clock checks in Hunt.run
+RUN_CLOCK_CHECK = 256
+
+
+class Hunt:
+    """Encounter counter, timer and shiny handling for one hunt, with no UI
+
+    Everything that happens is reported to the listeners registered with
+    subscribe() as an event dict, so the same hunt drives the Tk window and
+    the headless daemon. Rosters and samplers are shared between hunts; each
+    hunt only holds its counters and its own RNG, so thousands fit in memory.
+    Shinies are saved to store (the app's progress by default); pass None to
+    keep them in the hunt only.
+    """
+
+    __slots__ = (
+        "pokemon_data", "sampler", "shiny_rate", "rng", "store",
+        "hunt_id", "total_encounters", "total_shiny_found", "shiny_found",
+        "elapsed_time", "start_time", "_listeners",
+    )
+
+    def __init__(self, pokemon_data, sampler, shiny_rate, rng=None, store=APP_STORE):
+        if store is APP_STORE:
+            store = persistence.get_store()
+        self.pokemon_data = pokemon_data
+        self.sampler = sampler
+        self.shiny_rate = shiny_rate
+        self.rng = rng if rng is not None else random.Random()
+        self.store = store
+
+        self.hunt_id = 0
+        self.total_encounters = 0
+        self.total_shiny_found = store.total_shiny if store is not None else 0
+        self.shiny_found = False
+        self.elapsed_time = 0.0
+        self.start_time = None
+        self._listeners = []
+
+    # Events
+    def subscribe(self, callback):
+        """Call callback(event) for every event this hunt emits"""
+        self._listeners.append(callback)
+
+    def _emit(self, event):
+        for callback in self._listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.log_error("Error in hunt event listener", event=event.get("type"), hunt=self.hunt_id, error=str(e))
+
+    # Timer
+    @property
+    def timer_running(self):
+        return self.start_time is not None
+
+    def elapsed(self):
+        """Total hunting time, including the current stretch if the timer is running"""
+        if self.start_time is None:
+            return self.elapsed_time
+        return self.elapsed_time + time.monotonic() - self.start_time
+
+    def start_timer(self):
+        """Start (or resume) the timer"""
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+
+    def stop_timer(self):
+        """Pause the timer, keeping the time elapsed so far"""
+        self.elapsed_time = self.elapsed()
+        self.start_time = None
+
+    # Hunting
+    def start(self):
+        """Begin a hunt, or continue after a shiny, with the encounter counter at zero"""
+        # Each hunt is identified by its start time (kept unique within a session)
+        self.hunt_id = max(int(time.time()), self.hunt_id + 1)
+        self.total_encounters = 0
+        self.shiny_found = False
+        self.start_timer()
+        self._emit({"type": "hunt_started", "hunt": self.hunt_id, "time": time.time()})
+
+    def draw(self):
+        """Draw the species and shiny roll for an upcoming encounter"""
+        with sampling_time.time():
+            pokemon_name = self.sampler.draw(self.rng)
+            is_shiny = self.rng.randint(1, self.shiny_rate) == 1
+        if is_shiny:
+            return pokemon_name, True
+        if self.rng.randint(1, max(1, self.shiny_rate // 5)) == 1:
+            self._emit({"type": "shiny_nearby", "hunt": self.hunt_id, "time": time.time()})
+        return pokemon_name, False
+
+    def record(self, pokemon_name, is_shiny):
+        """Count an encounter; a shiny is saved and ends the hunt until start() is called"""
+        rarity = self.pokemon_data.get(pokemon_name)
+        self.total_encounters += 1
+        encounters.inc()
+        event = {
+            "type": "encounter",
+            "hunt": self.hunt_id,
+            "encounter": self.total_encounters,
+            "pokemon": pokemon_name,
+            "rarity": rarity,
+            "shiny": is_shiny,
+            "time": time.time(),
+        }
+        self._emit(event)
+
+        if is_shiny:
+            shinies.inc()
+            self.shiny_found = True
+            if self.store is not None:
+                self.total_shiny_found = self.store.record_shiny(pokemon_name, rarity)
+            else:
+                self.total_shiny_found += 1
+            self.stop_timer()
+            self._emit({
+                "type": "shiny",
+                "hunt": self.hunt_id,
+                "pokemon": pokemon_name,
+                "rarity": rarity,
+                "encounters": self.total_encounters,
+                "elapsed": round(self.elapsed(), 3),
+                "total_shiny": self.total_shiny_found,
+                "time": event["time"],
+            })
+        return event
+
+    def run(self, count, deadline=None, per_encounter=True):
+        """Draw and record up to count encounters as one batch, for fast-forwarding
+
+        Stops early at a shiny (recorded as usual, ending the hunt) or once
+        time.monotonic() passes deadline. Counters and metrics are updated
+        once per batch, and a single random() call decides both the shiny
+        and the "shiny nearby" rolls, with the same odds as draw().
+
+        With per_encounter, listeners get the same events as step() would
+        send. Without it they get one "encounters" event per batch listing
+        the species drawn, and no "shiny nearby" events, which keeps the
+        cost per encounter close to a bare sampler draw.
+        Returns (encounters recorded, last pokemon_name, last is_shiny).
+        """
+        rng = self.rng
+        random = rng.random
+        draw_index = self.sampler.draw_index
+        species = self.sampler.species
+        listeners = self._listeners
+        pokemon_data = self.pokemon_data
+        shiny_odds = 1 / self.shiny_rate
+        nearby_odds = shiny_odds + (1 - shiny_odds) / max(1, self.shiny_rate // 5)
+        emit_each = per_encounter and bool(listeners)
+        drawn = [] if listeners and not per_encounter else None
+        started = time.time()
+
+        recorded = 0
+        pokemon_name, is_shiny = None, False
+        while recorded < count:
+            pokemon_name = species[draw_index(rng)]
+            roll = random()
+            if roll < shiny_odds:
+                is_shiny = True
+                break
+            recorded += 1
+            if drawn is not None:
+                drawn.append(pokemon_name)
+            elif emit_each:
+                now = time.time()
+                if roll < nearby_odds:
+                    self._emit({"type": "shiny_nearby", "hunt": self.hunt_id, "time": now})
+                self._emit({
+                    "type": "encounter",
+                    "hunt": self.hunt_id,
+                    "encounter": self.total_encounters + recorded,
+                    "pokemon": pokemon_name,
+                    "rarity": pokemon_data.get(pokemon_name),
+                    "shiny": False,
+                    "time": now,
+                })
+            # Checking the clock every draw would cost more than the draw
+            if deadline is not None and not recorded % RUN_CLOCK_CHECK and time.monotonic() >= deadline:
+                break
+
+        if drawn:
+            self._emit({
+                "type": "encounters",
+                "hunt": self.hunt_id,
+                "first_encounter": self.total_encounters + 1,
+                "pokemon": drawn,
+                "started": started,
+                "time": time.time(),
+            })
+        self.total_encounters += recorded
+        encounters.inc(recorded)
+        if is_shiny:
+            self.record(pokemon_name, True)
+            recorded += 1
+        return recorded, pokemon_name, is_shiny
+
+    def status(self):
+        """Snapshot of the hunt's progress"""
+        return {
+            "hunt": self.hunt_id,
+            "encounters": self.total_encounters,
+            "shiny_found": self.shiny_found,
+            "total_shiny": self.total_shiny_found,
+            "elapsed": round(self.elapsed(), 3),
+            "timer_running": self.timer_running,
+        }
+
+    def step(self):
+        """Draw and record one encounter"""
+        return self.record(*self.draw())
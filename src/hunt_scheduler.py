@@ -0,0 +1,156 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+
+class ScheduledHunt:
+    """A hunt's place in the scheduler"""
+
+    __slots__ = ("hunt", "delay", "auto_continue", "deadline", "generation", "running")
+
+    def __init__(self, hunt, delay, auto_continue):
+        self.hunt = hunt
+        self.delay = delay
+        self.auto_continue = auto_continue
+        self.deadline = 0.0
+        # Bumped whenever the hunt is stopped or rescheduled, invalidating older heap entries
+        self.generation = 0
+        self.running = False
+
+
+class HuntScheduler:
+    """Runs many hunts in one thread from a heap of encounter deadlines
+
+    Each hunt keeps its own delay, roster and RNG; the scheduler only holds a
+    heap entry per running hunt, so an idle hunt costs no thread or task.
+    Hunts that find a shiny wait for resume() unless added with
+    auto_continue. All methods must be called from the thread running the
+    scheduler (use loop.call_soon_threadsafe from other threads).
+    """
+
+    def __init__(self):
+        self._hunts = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._wakeup = None
+        self._closed = False
+        self.steps = 0
+
+    def __len__(self):
+        return len(self._hunts)
+
+    def __contains__(self, key):
+        return key in self._hunts
+
+    def keys(self):
+        return self._hunts.keys()
+
+    def get(self, key):
+        """Return the Hunt added under key"""
+        return self._hunts[key].hunt
+
+    # Managing hunts
+    def add(self, key, hunt, delay, auto_continue=False):
+        """Start hunt under key, with an encounter every delay seconds"""
+        if key in self._hunts:
+            raise KeyError(f"A hunt named {key!r} already exists")
+        if delay <= 0:
+            raise ValueError("delay must be positive")
+        entry = ScheduledHunt(hunt, delay, auto_continue)
+        self._hunts[key] = entry
+        hunt.start()
+        self._schedule(key, entry, time.monotonic() + delay)
+        return hunt
+
+    def remove(self, key):
+        """Stop a hunt and forget it"""
+        self.stop(key)
+        del self._hunts[key]
+
+    def stop(self, key):
+        """Pause a hunt; its counters and timer are kept until resume()"""
+        entry = self._hunts[key]
+        entry.running = False
+        entry.generation += 1
+        entry.hunt.stop_timer()
+
+    def resume(self, key):
+        """Resume a paused hunt, or start a new one if it stopped on a shiny"""
+        entry = self._hunts[key]
+        if entry.running:
+            return
+        if entry.hunt.shiny_found:
+            entry.hunt.start()
+        else:
+            entry.hunt.start_timer()
+        self._schedule(key, entry, time.monotonic() + entry.delay)
+
+    def status(self, key):
+        """Progress of one hunt"""
+        entry = self._hunts[key]
+        return dict(entry.hunt.status(), running=entry.running, delay=entry.delay)
+
+    def _schedule(self, key, entry, deadline):
+        entry.running = True
+        entry.generation += 1
+        entry.deadline = deadline
+        heapq.heappush(self._heap, (deadline, next(self._counter), key, entry.generation))
+        # A new earliest deadline must cut the current sleep short
+        if self._wakeup is not None and self._heap[0][2] == key:
+            self._wakeup.set()
+
+    # Running
+    def run_due(self, now=None):
+        """Run every encounter whose deadline has passed; returns the next deadline or None"""
+        if now is None:
+            now = time.monotonic()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, _, key, generation = heapq.heappop(heap)
+            entry = self._hunts.get(key)
+            # Stale entry for a hunt that was stopped, removed or rescheduled
+            if entry is None or entry.generation != generation:
+                continue
+
+            hunt = entry.hunt
+            hunt.step()
+            self.steps += 1
+            if hunt.shiny_found:
+                if not entry.auto_continue:
+                    entry.running = False
+                    continue
+                hunt.start()
+
+            # Deadlines advance by whole delays; ticks missed while blocked are skipped
+            delay = entry.delay
+            deadline += delay
+            if deadline < now:
+                deadline += ((now - deadline) // delay + 1) * delay
+            entry.deadline = deadline
+            heapq.heappush(heap, (deadline, next(self._counter), key, generation))
+        return heap[0][0] if heap else None
+
+    async def run(self, max_steps=None):
+        """Run hunts until close() is called (or max_steps encounters have run)"""
+        self._wakeup = asyncio.Event()
+        try:
+            while not self._closed and (max_steps is None or self.steps < max_steps):
+                next_deadline = self.run_due()
+                timeout = None if next_deadline is None else max(0.0, next_deadline - time.monotonic())
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeup = None
+
+    def close(self):
+        """Stop run() and pause every hunt"""
+        self._closed = True
+        for key, entry in self._hunts.items():
+            if entry.running:
+                self.stop(key)
+        if self._wakeup is not None:
+            self._wakeup.set()
@@ -1,60 +1,123 @@
-import os
+import atexit
+import json
 import logging
-from datetime import datetime
-from pathlib import Path
+import queue
+import threading
+from logging.handlers import QueueHandler, RotatingFileHandler
 from config_loader import get_base_path
 
+# error.log starts a new file at this size, keeping this many old ones (error.log.1, ...)
+ERROR_LOG_MAX_BYTES = 1024 * 1024
+ERROR_LOG_BACKUPS = 3
+
+# Most records written between two flushes of error.log
+WRITE_BATCH = 256
+
+# Seconds shutdown() waits for queued records to be written
+SHUTDOWN_TIMEOUT = 2.0
+
+_STOP = object()
+
+
+class StructuredFormatter(logging.Formatter):
+    """The usual log line followed by the record's fields as key=value pairs (values as JSON)"""
+
+    def format(self, record):
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={json.dumps(value, default=str)}" for key, value in fields.items())
+        return line
+
+
+class BatchedRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that leaves flushing to the writer, once per batch"""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+
+class LogWriter:
+    """Background thread writing queued log records to a handler in batches"""
+
+    def __init__(self, records, handler):
+        self.records = records
+        self.handler = handler
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = [self.records.get()]
+            while len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is _STOP:
+                    stopping = True
+                else:
+                    self.handler.handle(record)
+            self.handler.flush_batch()
+        self.handler.close()
+
+    def stop(self, timeout=SHUTDOWN_TIMEOUT):
+        """Write what is queued, then stop"""
+        if self._thread.is_alive():
+            self.records.put(_STOP)
+            self._thread.join(timeout)
+
+
 class LogManager:
+    """Error log whose callers only enqueue; a background thread writes error.log
+
+    A slow disk never holds up the encounter or animation paths.
+    error.log rotates at ERROR_LOG_MAX_BYTES and each line can carry
+    structured fields: log_error("Error decoding sprite", pokemon="Abra").
+    """
+
     def __init__(self):
         base_path = get_base_path()
         # Setup log directory
         self.logs_dir = base_path['data'] / "logs"
         self.logs_dir.mkdir(exist_ok=True)
 
-        # Configure error logging
+        # Configure error logging: the logger's only handler puts records on a queue
+        self._records = queue.SimpleQueue()
         self.error_logger = logging.getLogger('error_logger')
         self.error_logger.setLevel(logging.ERROR)
-        error_handler = logging.FileHandler(self.logs_dir / 'error.log')
-        error_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-        self.error_logger.addHandler(error_handler)
+        self.error_logger.addHandler(QueueHandler(self._records))
+        error_handler = BatchedRotatingFileHandler(
+            self.logs_dir / 'error.log',
+            maxBytes=ERROR_LOG_MAX_BYTES,
+            backupCount=ERROR_LOG_BACKUPS,
+            encoding="utf-8",
+            delay=True
+        )
+        error_handler.setFormatter(StructuredFormatter('%(asctime)s - %(levelname)s - [%(threadName)s] %(message)s'))
+        self._writer = LogWriter(self._records, error_handler)
+        atexit.register(self.shutdown)
 
-        # Initialize shiny encounter tracking
+        # Shiny encounters are kept by the persistence store
         self.shiny_log_path = self.logs_dir / 'shinies_encountered.txt'
-        self.shiny_encounters = self._load_shiny_encounters()
-
-    def _load_shiny_encounters(self):
-        """Load previous shiny encounters from log file"""
-        encounters = {}
-        if os.path.exists(self.shiny_log_path):
-            with open(self.shiny_log_path, 'r') as f:
-                for line in f:
-                    try:
-                        name, rarity, count = line.strip().split(' | ')
-                        encounters[name] = {'rarity': rarity, 'count': int(count)}
-                    except ValueError:
-                        self.error_logger.error(f"Invalid line in shiny log: {line.strip()}")
-        return encounters
-
-    def log_error(self, message):
-        """Log error message to error.log"""
-        self.error_logger.error(message)
+
+    def log_error(self, message, **fields):
+        """Queue an error for error.log, with optional structured fields"""
+        self.error_logger.error(message, extra={"fields": fields} if fields else None)
 
     def log_shiny(self, pokemon_name, rarity):
-        """Record shiny Pokemon encounter in log file"""
-        # Update encounter count
-        if pokemon_name in self.shiny_encounters:
-            self.shiny_encounters[pokemon_name]['count'] += 1
-        else:
-            self.shiny_encounters[pokemon_name] = {'rarity': rarity, 'count': 1}
-        
-        try:
-            # Write updated encounters to log file
-            with open(self.shiny_log_path, 'w', encoding='utf-8') as f:
-                for name, data in sorted(self.shiny_encounters.items()):
-                    f.write(f"{name} | {data['rarity']} | {data['count']}\n")
-        except Exception as e:
-            self.error_logger.error(f"Error writing to shiny log: {str(e)}")
-            return True  # Return success even if logging failed
+        """Record shiny Pokemon encounter in the shiny log (written in the background)"""
+        from persistence import get_store
+        get_store().log_shiny(pokemon_name, rarity)
+
+    def shutdown(self):
+        """Write every queued error and close error.log"""
+        self._writer.stop()
 
 # Create global logger instance
-logger = LogManager() 
\ No newline at end of file
+logger = LogManager()
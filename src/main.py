@@ -1,17 +1,37 @@
+from startup import startup_timer
 import os
-import random
-import time
 import threading
-import pygame
+import time
 from PIL import Image, ImageTk 
 import tkinter as tk
 from colorama import Fore, Style
-from config_loader import load_config, check_file_exists
+from console import console
+from config_loader import load_config, check_file_exists, file_sha256
+from config_watcher import ConfigWatcher
 from data_manager import DataManager
+from encounter_manager import EncounterManager
+from encounter_log import EncounterLogWriter
+from hunt import Hunt
+from offline import HEARTBEAT_INTERVAL, catch_up
+from animation import AnimationEngine
+from asset_cache import AssetCache
+from biomes import BiomeSet
+from audio import AudioManager
+from frame_cache import FrameCache
+from prefetch import EncounterPrefetcher
+from sampler import SpeciesSampler
+from scheduler import TkScheduler
+from sprite_bundle import SpriteBundle
+from sprite_index import SpriteIndex, report_missing
+from sprite_loader import decode_sprite
 from logger import logger
+from metrics import metrics, start_from_config
+from persistence import get_store
 from pathlib import Path
 import sys
 
+startup_timer.mark("imports")
+
 # Print startup info
 print("Starting application...")
 print(f"Executable path: {sys.executable}")
@@ -31,7 +51,9 @@ PROJECT_ROOT = get_base_path()
 
 # Initialize core components
 config = load_config()
+store = get_store()
 data_manager = DataManager(config)
+encounter_manager = EncounterManager(config)
 
 # Load configuration values
 shiny_count_file = config["shiny_count_file"]
@@ -39,57 +61,161 @@ encounter_delay = config["encounter_delay"]
 rarity_weights = config["rarity_weights"]
 shiny_rate = config["shiny_rate"]
 mute_audio = config["mute_audio"]
+frame_cache = FrameCache(config["frame_cache_mb"])
+# Resized backgrounds and decoded sprites, kept across runs
+asset_cache = AssetCache(config["asset_cache_dir"], config["asset_cache_mb"])
+sprite_scale = config["sprite_scale"]
 
 # Verify required files exist
 check_file_exists(shiny_count_file)
 for gen_file in config["pokemon_data_files"].values():
     check_file_exists(gen_file)
+startup_timer.mark("config")
+
+# Index every sprite once instead of probing the filesystem per encounter,
+# reading from the packed sprite bundle when one has been built
+sprite_bundle = SpriteBundle.open_default()
+sprite_index = SpriteIndex(PROJECT_ROOT / "assets" / "gifs", config["sprite_manifest_file"], sprite_bundle).build()
+report_missing(sprite_index, data_manager.load_pokemon_data().keys())
+# Frame counts and durations come from the manifest, refreshed in the background
+threading.Thread(target=sprite_index.load_metadata, daemon=True).start()
+startup_timer.mark("sprite index")
+
+# The sampler is built once per roster and weights, and once per biome
+biomes = BiomeSet(
+    data_manager.load_pokemon_data(),
+    config["biomes"],
+    rarity_weights,
+    default_sampler=encounter_manager.get_sampler(data_manager.load_pokemon_data())
+)
+starting_biome = config["biome"]
+if starting_biome == "auto":
+    starting_biome = biomes.for_hour(time.localtime().tm_hour)
+if starting_biome not in biomes:
+    logger.log_error(f"Unknown biome {starting_biome}, using the whole roster")
+    starting_biome = "default"
+sampler = biomes.switch(starting_biome).sampler
+
+# Credit the encounters missed while the app was closed, before the counters are read
+offline_progress = None
+if config["offline_progress"]:
+    offline_progress = catch_up(
+        store,
+        sampler,
+        data_manager.load_pokemon_data(),
+        shiny_rate,
+        encounter_delay,
+        max_hours=config["offline_progress_max_hours"]
+    )
+    if offline_progress.encounters:
+        print(offline_progress.summary())
+
+# Counters, timer and shiny handling live in the hunt; main only draws them
+hunt = Hunt(data_manager.load_pokemon_data(), sampler, shiny_rate, store=store)
 
 # Initialize state variables
 current_encounter = None
-total_encounters = 0
-total_shiny_found = 0
-shiny_found = False
-elapsed_time = 0
-start_time = None
-timer_running = False
-frames = []
+current_sprite = None
+latest_encounter = None
+visible_encounter = None
+# Working-set sprites still decoding, to be put in the frame cache when done
+warming = []
+
+# Optional binary log of every encounter
+encounter_log = None
+if config["encounter_log"]:
+    encounter_log = EncounterLogWriter(
+        config["encounter_log_dir"],
+        data_manager.load_pokemon_data().keys(),
+        max_file_mb=config["encounter_log_max_mb"],
+        max_files=config["encounter_log_max_files"],
+        flush_interval=config["persistence_flush_interval"]
+    )
+    hunt.subscribe(encounter_log.handle_event)
+
+# How often to check whether a prefetched sprite has finished decoding (ms)
+DECODE_POLL_MS = 10
+# How often to check on a biome's working set being decoded (ms)
+WARM_POLL_MS = 100
+
+# Turbo runs the simulation in batches every TURBO_TICK seconds, spending at
+# most TURBO_BUDGET of each tick drawing so the window stays responsive
+TURBO_TICK = 0.05
+TURBO_BUDGET = 0.6
+# Ctrl+T steps through these multipliers (0 is as fast as the sampler goes)
+TURBO_LEVELS = (1, 10, 100, 1000, 0)
 
-# Initialize audio
-pygame.mixer.init()
+turbo = config["turbo"]
+# Fraction of an encounter carried over to the next turbo tick
+turbo_credit = 0.0
+# Newest turbo encounter not drawn yet
+turbo_latest = None
+
+# Sounds are decoded and the mixer opened on the first unmuted play
+audio = AudioManager(PROJECT_ROOT / "assets" / "sounds", muted=mute_audio)
 
 # Setup main window
 root = tk.Tk()
 root.title("IdleMon")
 root.minsize(500, 500)
 
-# Load background image
-background_image_path = config["background_image"]
-if os.path.isabs(background_image_path):
-    # Use absolute path if provided
-    background_path = Path(background_image_path)
-else:
-    # Use path relative to executable
-    background_path = PROJECT_ROOT / background_image_path
-
-# Fallback to default background if specified path doesn't exist
-if not check_file_exists(background_path):
-    print(f"Warning: Could not find background image at {background_path}")
-    print("Falling back to default background...")
-    background_path = PROJECT_ROOT / "assets" / "images" / "default_background.jpg"
+# All periodic work runs on the Tk event loop
+scheduler = TkScheduler(root)
+startup_timer.mark("window")
+
+# Find a background image, falling back to the default background
+def resolve_background(background_image_path):
+    if os.path.isabs(background_image_path):
+        # Use absolute path if provided
+        background_path = Path(background_image_path)
+    else:
+        # Use path relative to executable
+        background_path = PROJECT_ROOT / background_image_path
+
+    # Fallback to default background if specified path doesn't exist
     if not check_file_exists(background_path):
-        print(f"Error: Could not find default background image at {background_path}")
-        root.destroy()
-        sys.exit(1)
+        print(f"Warning: Could not find background image at {background_path}")
+        print("Falling back to default background...")
+        background_path = PROJECT_ROOT / "assets" / "images" / "default_background.jpg"
+        if not check_file_exists(background_path):
+            print(f"Error: Could not find default background image at {background_path}")
+            return None
+    return background_path
 
 # Load and scale background image
-pil_image = Image.open(background_path)
-# Scale to fit 500px height while maintaining aspect ratio
 target_height = 500
-scale = target_height / pil_image.height
-target_width = int(pil_image.width * scale)
-pil_image = pil_image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+
+def load_background(background_path):
+    def scale_background():
+        with Image.open(background_path) as image:
+            # Scale to fit 500px height while maintaining aspect ratio
+            scale = target_height / image.height
+            target_width = int(image.width * scale)
+            return [image.resize((target_width, target_height), Image.Resampling.LANCZOS)], {}
+
+    # Only resized again when the image or the target height changes
+    return asset_cache.derive(
+        file_sha256(background_path), "background", {"height": target_height}, scale_background
+    )[0][0]
+
+# Background of each biome, resolved once (and again when the config changes)
+biome_backgrounds = {}
+
+def resolve_biome_backgrounds():
+    biome_backgrounds.clear()
+    for biome_name in biomes.names():
+        biome_background = biomes.get(biome_name).background or config["background_image"]
+        biome_backgrounds[biome_name] = resolve_background(biome_background)
+
+resolve_biome_backgrounds()
+if biome_backgrounds[biomes.active.name] is None:
+    root.destroy()
+    sys.exit(1)
+
+pil_image = load_background(biome_backgrounds[biomes.active.name])
 background_image = ImageTk.PhotoImage(pil_image)
+# PhotoImages of backgrounds already shown, by path
+background_photos = {biome_backgrounds[biomes.active.name]: background_image}
 
 # Get dimensions of the scaled background
 background_width = background_image.width()
@@ -98,264 +224,286 @@ background_height = background_image.height()
 # Set Tkinter window constraints
 root.maxsize(background_width, background_height)
 root.resizable(width=True, height=False)
+startup_timer.mark("background")
 
-# Update shiny count and save it
+# Show the shiny total (the hunt saves it in the background)
 def update_shiny_count():
-    global total_shiny_found
-    total_shiny_found += 1
-    shiny_label.config(text=f"Shiny Pokémon Found: {total_shiny_found}")
-    data_manager.save_shiny_count(total_shiny_found)
+    scheduler.update_widget(shiny_label, text=f"Shiny Pokémon Found: {hunt.total_shiny_found}")
 
 # Initialize shiny count from file
 def initialize_shiny_count():
-    global total_shiny_found
-    total_shiny_found = data_manager.load_shiny_count()
-    shiny_label.config(text=f"Shiny Pokémon Found: {total_shiny_found}")
+    shiny_label.config(text=f"Shiny Pokémon Found: {hunt.total_shiny_found}")
 
-# Handle shiny Pokémon encounter
+# Handle shiny Pokémon encounter (already counted and saved by the hunt)
 def handle_shiny_encounter(pokemon_name, pokemon_rarity):
-    global shiny_found, timer_running
     try:
-        shiny_found = True
-        info_label.config(
+        scheduler.update_widget(
+            info_label,
             text=f"{pokemon_name} - {pokemon_rarity} (Shiny!)",
             fg="gold"
         )
-        print(Fore.YELLOW + f"Congrats!!! You found a shiny {pokemon_name} after {total_encounters} encounters!" + Style.RESET_ALL)
-        
-        # Play shiny encounter sound if not muted
-        if not mute_audio:
-            shiny_sound_path = PROJECT_ROOT / "assets" / "sounds" / "shiny_sound1.wav"
-            if os.path.exists(shiny_sound_path):
-                try:
-                    sound = pygame.mixer.Sound(shiny_sound_path)
-                    sound.play()
-                except pygame.error as e:
-                    logger.log_error(f"Error playing shiny sound: {e}")
-            else:
-                logger.log_error(f"Shiny sound file not found: {shiny_sound_path}")
+        console.say(Fore.YELLOW + f"Congrats!!! You found a shiny {pokemon_name} after {hunt.total_encounters} encounters!" + Style.RESET_ALL)
         
+        audio.play("shiny_sound1")
         update_shiny_count()
-        # Try to log the shiny, but continue even if it fails
-        try:
-            logger.log_shiny(pokemon_name, pokemon_rarity)
-        except Exception as e:
-            logger.log_error(f"Error logging shiny: {str(e)}")
-            
+
         continue_button.place(relx=0.5, rely=0.5, anchor="center")
-        timer_running = False
+        stop_timer()
     except Exception as e:
-        logger.log_error(f"Error in handle_shiny_encounter: {str(e)}")
+        logger.log_error("Error in handle_shiny_encounter", pokemon=pokemon_name, error=str(e))
         # Ensure the continue button appears even if there's an error
         continue_button.place(relx=0.5, rely=0.5, anchor="center")
-        timer_running = False
+        stop_timer()
 
 # Load Pokémon data
 def initialize_pokemon_data():
     global pokemon_data
     pokemon_data = data_manager.load_pokemon_data()
 
-# Calculate encounter weights based on rarity
-def calculate_weights(pokemon_data):
-    weights = [rarity_weights.get(rarity, 0) for rarity in pokemon_data.values()]
-    return weights
-
-# Simulate shiny encounter
-def shiny_pokemon():
-    shiny_value = random.randint(1, shiny_rate)
-    if shiny_value == 1:
-        return True
-    elif random.randint(1, shiny_rate // 5) == 1:
-        print(Fore.MAGENTA + "You hear a shiny Pokémon nearby..." + Style.RESET_ALL)
-    return False
-
-# Display the Pokémon GIF
-def display_pokemon_gif(pokemon_name, is_shiny=False):
-    global current_encounter, frames
-    
-    # Get the new gif path using the correct subdirectory
-    gif_subdir = "shiny" if is_shiny else "normal"
-    
-    # Try each generation's directory until we find the GIF
-    for gen in range(1, 6):
-        new_gif_path = PROJECT_ROOT / "assets" / "gifs" / f"gen{gen}" / gif_subdir / f"{pokemon_name}.gif"
-        if new_gif_path.exists():
-            break
-    else:
-        print(f"GIF file not found for {pokemon_name} in any generation directory")
+# Print hunt events that have no widget of their own
+def on_hunt_event(event):
+    # In turbo these would scroll past faster than anyone can read
+    if event["type"] == "shiny_nearby" and turbo == 1:
+        console.say(Fore.MAGENTA + "You hear a shiny Pokémon nearby..." + Style.RESET_ALL, kind="shiny nearby")
+
+# Look up the Pokémon GIF (bundle slice or loose file) in the sprite index built at startup
+def find_sprite(pokemon_name, is_shiny=False):
+    return sprite_index.source(pokemon_name, is_shiny)
+
+# Where the Pokémon sprite sits on the canvas
+def pokemon_position(canvas_width, canvas_height):
+    return canvas_width // 2, (canvas_height * 3.75) // 5
+
+# Decode a sprite at the configured scale, reusing frames saved by earlier runs,
+# with its RGBA frames ready so the Tk thread only has to create the PhotoImages
+def decode_encounter_sprite(sprite):
+    decoded = decode_sprite(sprite, sprite_scale, asset_cache)
+    decoded.display_frames()
+    return decoded
+
+# Turn a decoded sprite into Tk images and keep them in the frame cache (Tk thread only)
+def cache_frames(cache_key, decoded):
+    # Prefetched sprites arrive with their RGBA frames ready; only the PhotoImages are made here
+    frames = [ImageTk.PhotoImage(frame_image) for frame_image in decoded.display_frames()]
+    cached = (frames, decoded.durations, decoded.centre_offsets())
+    frame_cache.put(cache_key, cached, decoded.nbytes)
+    return cached
+
+# Decode a biome's most likely sprites in the background and cache their frames,
+# so the first encounters after a switch need no decoding
+def warm_working_set(biome):
+    global warming
+    warming = prefetcher.warm((pokemon_name, False) for pokemon_name in biome.working_set)
+    if warming:
+        root.after(WARM_POLL_MS, cache_warmed, warming)
+
+# Move finished working-set decodes into the frame cache
+def cache_warmed(pending_list):
+    # A biome switch or a new sprite scale replaced this working set
+    if pending_list is not warming:
         return
-    
-    # Set animation speed to 100ms per frame for all Pokémon
-    FRAME_DELAY = 67
+    still_decoding = []
+    for pending in pending_list:
+        if not pending.future.done():
+            still_decoding.append(pending)
+            continue
+        cache_key = (pending.pokemon_name, pending.is_shiny)
+        try:
+            decoded = pending.result()
+        except Exception as e:
+            logger.log_error("Error decoding sprite", pokemon=pending.pokemon_name, shiny=pending.is_shiny, error=str(e))
+            continue
+        if decoded is not None and cache_key not in frame_cache:
+            cache_frames(cache_key, decoded)
+    pending_list[:] = still_decoding
+    if still_decoding:
+        root.after(WARM_POLL_MS, cache_warmed, pending_list)
+
+# Display the Pokémon GIF (must run on the Tk thread)
+def display_pokemon_gif(pokemon_name, is_shiny=False, decoded=None):
+    global current_encounter, current_sprite
+
+    # Reuse decoded frames when this sprite was shown recently
+    cache_key = (pokemon_name, is_shiny)
+    cached = frame_cache.get(cache_key)
+    if cached is not None:
+        new_frames, durations, offsets = cached
+    else:
+        # Decode inline only if the prefetch pipeline did not do it already
+        if decoded is None:
+            sprite = find_sprite(pokemon_name, is_shiny)
+            if sprite is None:
+                console.say(f"GIF file not found for {pokemon_name} in any generation directory")
+                return
+            try:
+                decoded = decode_encounter_sprite(sprite)
+            except FileNotFoundError:
+                console.say(f"GIF file not found: {sprite}")
+                return
+            except Image.UnidentifiedImageError:
+                console.say(f"Invalid image format for {pokemon_name}")
+                return
+            except Exception as e:
+                console.say(f"Unexpected error loading {pokemon_name}: {e}")
+                return
 
-    # Stop any existing animation and clear the canvas
-    if hasattr(display_pokemon_gif, 'after_id') and display_pokemon_gif.after_id:
-        root.after_cancel(display_pokemon_gif.after_id)
-        display_pokemon_gif.after_id = None
-    canvas.delete("pokemon_gif")  # Clear any existing Pokémon image
+        new_frames, durations, offsets = cache_frames(cache_key, decoded)
 
-    # Clear existing frames to prevent memory leaks
-    if hasattr(display_pokemon_gif, 'current_frames'):
-        display_pokemon_gif.current_frames = None
+    # Replace the previous Pokémon's animation, timed by the GIF's own frame durations
+    animator.play("pokemon", new_frames, durations, pokemon_position, offsets)
+    current_sprite = cache_key
 
-    # Create a new list for the new frames
-    try:
-        image = Image.open(new_gif_path)
-        new_frames = []
-        
-        # Extract frames for animated GIFs
-        for frame in range(0, image.n_frames):
-            image.seek(frame)
-            # Convert to RGBA to ensure consistent format
-            frame_image = image.convert('RGBA')
-            new_frames.append(ImageTk.PhotoImage(frame_image))
-
-        image.close()  # Properly close the image file
-        
-        # Store the new frames
-        display_pokemon_gif.current_frames = new_frames
-        display_pokemon_gif.current_gif_path = new_gif_path
-
-    except FileNotFoundError:
-        print(f"GIF file not found: {new_gif_path}")
-        return
-    except Image.UnidentifiedImageError:
-        print(f"Invalid image format for {new_gif_path}")
-        return
-    except Exception as e:
-        print(f"Unexpected error loading {pokemon_name}: {e}")
-        return
-
-    # Define animation function
-    def animate(frame_index=0):
-        # If we've switched to a different Pokémon, stop this animation
-        if not hasattr(display_pokemon_gif, 'current_frames') or display_pokemon_gif.current_gif_path != new_gif_path:
-            return
-            
-        try:
-            current_frames = display_pokemon_gif.current_frames
-            if not current_frames:  # Safety check
-                return
-                
-            # Calculate the center of the canvas
-            canvas_width = canvas.winfo_width()
-            canvas_height = canvas.winfo_height()
-            center_x = canvas_width // 2
-            center_y = (canvas_height * 3.75) // 5
-            
-            # Clear previous frame and draw new one
-            canvas.delete("pokemon_gif")
-            current_frame = frame_index % len(current_frames)
-            canvas.create_image(center_x, center_y, image=current_frames[current_frame], tag="pokemon_gif")
-            
-            # Schedule next frame only if this is still the current animation
-            if display_pokemon_gif.current_gif_path == new_gif_path:
-                next_frame = (frame_index + 1) % len(current_frames)
-                display_pokemon_gif.after_id = root.after(
-                    FRAME_DELAY,
-                    lambda: animate(next_frame)
-                )
-        except Exception as e:
-            print(f"Animation error: {e}")
-            return
-    
-    # Start the animation
-    if hasattr(display_pokemon_gif, 'current_frames') and display_pokemon_gif.current_frames:
-        animate(0)
-    
     # Update current encounter
     current_encounter = pokemon_name
 
 # Update the timer label
 def update_timer():
-    global elapsed_time, start_time, timer_running
-    while timer_running:
-        if start_time is not None:
-            elapsed_time += time.time() - start_time
-            start_time = time.time()
-        minutes, seconds = divmod(int(elapsed_time), 60)
-        stats_label.config(text=f"Time Elapsed: {minutes:02}:{seconds:02}")
-        time.sleep(1)
+    minutes, seconds = divmod(int(hunt.elapsed()), 60)
+    scheduler.update_widget(stats_label, text=f"Time Elapsed: {minutes:02}:{seconds:02}")
+
+# Start (or resume) the timer
+def start_timer():
+    hunt.start_timer()
+    scheduler.every("timer", 1.0, update_timer, pause_when_hidden=True)
+
+# Pause the timer, keeping the time elapsed so far
+def stop_timer():
+    hunt.stop_timer()
+    scheduler.cancel("timer")
+    update_timer()
 
 # Handle the "Continue" button click
 def continue_hunt():
-    global shiny_found, start_time, timer_running, total_encounters
+    # Start a new hunt, which resets the encounters counter
+    hunt.start()
+    scheduler.update_widget(encounter_label, text=f"Encounters: {hunt.total_encounters}")
+    audio.play("continue_sound1")
 
-    # Reset encounters counter when continuing
-    total_encounters = 0
-    encounter_label.config(text=f"Encounters: {total_encounters}")
-
-    # Play continue button sound if not muted
-    if not mute_audio:
-        continue_sound_path = PROJECT_ROOT / "assets" / "sounds" / "continue_sound1.wav"
-        if os.path.exists(continue_sound_path):
-            try:
-                sound = pygame.mixer.Sound(continue_sound_path)
-                sound.play()
-            except pygame.error as e:
-                logger.log_error(f"Error playing continue sound: {e}")
-        else:
-            logger.log_error(f"Continue sound file not found: {continue_sound_path}")
-
-    shiny_found = False
-    start_time = time.time()
     continue_button.place_forget()
-    if not timer_running:
-        timer_running = True
-        threading.Thread(target=update_timer, daemon=True).start()
-    start_encounter_thread()
+    if not scheduler.is_running("timer"):
+        start_timer()
+    start_encounter_loop()
 
-# Start the encounter loop
-def start_encounter():
-    global current_encounter, total_encounters, shiny_found
+# Run one encounter (scheduled on the Tk event loop every encounter_delay seconds)
+def encounter_tick():
+    global current_encounter, latest_encounter
 
-    # Load Pokémon data
-    pokemon_data = data_manager.load_pokemon_data()
-    if not pokemon_data:
-        print("No Pokémon data available. Exiting encounter loop.")
+    # Take the next prefetched encounter (species and shiny roll drawn ahead of time)
+    pending = prefetcher.next_encounter()
+    pokemon_name = pending.pokemon_name
+    current_encounter = pokemon_name
+    latest_encounter = pending
+
+    # The hunt counts it, and saves it right away if it's shiny
+    event = hunt.record(pokemon_name, pending.is_shiny)
+    scheduler.update_widget(encounter_label, text=f"Encounters: {hunt.total_encounters}")
+
+    # A shiny ends the hunt until the player continues
+    if pending.is_shiny:
+        scheduler.cancel("encounter")
+    else:
+        console.say(f"You encountered a wild {pokemon_name}!", kind="encounter")
+
+    show_when_decoded(pending, event["rarity"])
+
+# Run a batch of encounters (scheduled every TURBO_TICK seconds in turbo)
+def turbo_tick():
+    global current_encounter, turbo_credit, turbo_latest
+
+    if turbo:
+        turbo_credit += turbo * TURBO_TICK / encounter_delay
+        count = int(turbo_credit)
+        turbo_credit -= count
+        if not count:
+            return
+    else:
+        count = sys.maxsize
+    # Whatever the multiplier, a batch never holds the event loop past its budget
+    # Listeners get one event per batch rather than one per encounter
+    recorded, pokemon_name, is_shiny = hunt.run(
+        count, time.monotonic() + TURBO_TICK * TURBO_BUDGET, per_encounter=False
+    )
+    if not recorded:
+        return
+    current_encounter = pokemon_name
+    scheduler.update_widget(encounter_label, text=f"Encounters: {hunt.total_encounters}")
+
+    # A shiny always ends the hunt and is shown, however fast the hunt ran
+    if is_shiny:
+        scheduler.cancel("encounter")
+        scheduler.cancel("turbo_render")
+        turbo_latest = None
+        show_drawn_encounter(pokemon_name, True)
+    else:
+        turbo_latest = pokemon_name
+
+# Draw the newest turbo encounter (scheduled every 1 / turbo_render_fps seconds)
+def render_turbo():
+    global turbo_latest
+    if turbo_latest is not None:
+        pokemon_name, turbo_latest = turbo_latest, None
+        show_drawn_encounter(pokemon_name, False)
+
+# Show an encounter drawn outside the prefetch queue, decoding its sprite in the background
+def show_drawn_encounter(pokemon_name, is_shiny):
+    global latest_encounter
+    pending = prefetcher.request(pokemon_name, is_shiny)
+    latest_encounter = pending
+    show_when_decoded(pending, hunt.pokemon_data.get(pokemon_name))
+
+# Show an encounter once its background decode has finished
+def show_when_decoded(pending, pokemon_rarity):
+    # Poll rather than block the event loop while the sprite decodes
+    if pending.future is not None and not pending.future.done():
+        root.after(DECODE_POLL_MS, show_when_decoded, pending, pokemon_rarity)
+        return
+    # A newer encounter already replaced this one
+    if pending is not latest_encounter:
         return
-    
-    # Extract Pokémon names and calculate weights
-    pokemon_list = list(pokemon_data.keys())
-    weights = calculate_weights(pokemon_data)
-
-    # Encounter loop
-    while not shiny_found:
-        time.sleep(encounter_delay)
-        total_encounters += 1
-        encounter_label.config(text=f"Encounters: {total_encounters}")
-
-        # Randomly select a Pokémon based on weights
-        pokemon_name = random.choices(pokemon_list, weights=weights, k=1)[0]
-        pokemon_rarity = pokemon_data[pokemon_name]
-        current_encounter = pokemon_name
-
-        # Determine if the encounter is shiny
-        is_shiny = shiny_pokemon()
-
-        # Display Pokémon gif
-        display_pokemon_gif(pokemon_name, is_shiny=is_shiny)
-
-        # Update info label for shiny or normal Pokémon
-        if is_shiny:
-            handle_shiny_encounter(pokemon_name, pokemon_rarity)
-        else:
-            info_label.config(
-                text=f"{pokemon_name} - {pokemon_rarity}",
-                fg="white"
-            )
-            print(f"You encountered a wild {pokemon_name}!")
 
-# Start encounter simulation
-def start_encounter_thread():
-    threading.Thread(target=start_encounter, daemon=True).start()
+    try:
+        decoded = pending.result()
+    except Exception as e:
+        logger.log_error("Error decoding sprite", pokemon=pending.pokemon_name, shiny=pending.is_shiny, error=str(e))
+        decoded = None
+    show_encounter(pending.pokemon_name, pokemon_rarity, pending.is_shiny, decoded)
+
+# Show an encounter on screen
+def show_encounter(pokemon_name, pokemon_rarity, is_shiny, decoded):
+    global visible_encounter
+    visible_encounter = (pokemon_name, is_shiny)
+
+    # Display Pokémon gif (skipped while minimized, redrawn on restore)
+    if not scheduler.hidden:
+        display_pokemon_gif(pokemon_name, is_shiny=is_shiny, decoded=decoded)
+
+    # Update info label for shiny or normal Pokémon
+    if is_shiny:
+        handle_shiny_encounter(pokemon_name, pokemon_rarity)
+    else:
+        scheduler.update_widget(
+            info_label,
+            text=f"{pokemon_name} - {pokemon_rarity}",
+            fg="white"
+        )
 
-# Initialize the timer
-def initialize_timer():
-    global start_time, timer_running
-    start_time = time.time()
-    timer_running = True
-    threading.Thread(target=update_timer, daemon=True).start()
+# Show the latest Pokémon if it changed while the window was minimized
+def on_visibility_change(visible):
+    if visible and visible_encounter is not None and visible_encounter != current_sprite:
+        display_pokemon_gif(*visible_encounter)
+
+# Start encounter simulation
+def start_encounter_loop():
+    if not data_manager.load_pokemon_data():
+        print("No Pokémon data available. Exiting encounter loop.")
+        return
+    if turbo == 1:
+        scheduler.cancel("turbo_render")
+        scheduler.every("encounter", encounter_delay, encounter_tick)
+    else:
+        # The simulation and the drawing run at their own rates
+        scheduler.every("encounter", TURBO_TICK, turbo_tick)
+        scheduler.every("turbo_render", 1 / config["turbo_render_fps"], render_turbo, pause_when_hidden=True)
 
 # Add label with a semi-transparent background to the canvas
 def create_label_with_background(canvas, text, x, y, width, height, font=("Arial", 10)):
@@ -373,7 +521,10 @@ canvas_width = 500
 canvas_height = 500
 canvas = tk.Canvas(root, width=canvas_width, height=canvas_height)
 canvas.pack(fill="both", expand=False)
-canvas.create_image(0, 0, image=background_image, anchor="nw")
+background_item = canvas.create_image(0, 0, image=background_image, anchor="nw")
+
+# Sprite animations pause on their own while the window is minimized
+animator = AnimationEngine(root, canvas, scheduler)
 
 # Create labels
 info_label, info_bg = create_label_with_background(canvas, "Walking through the Pokemon world...", 10, 10, 200, 20)
@@ -391,16 +542,262 @@ continue_button = tk.Button(
     fg="white"
 )
 
+# Decode upcoming encounters in the background
+prefetcher = EncounterPrefetcher(
+    hunt.draw,
+    find_sprite,
+    depth=config["prefetch_depth"],
+    workers=config["decode_workers"],
+    frame_cache=frame_cache,
+    decode=decode_encounter_sprite
+)
+
+# Ctrl+M mutes or unmutes for this session; muting frees the audio device
+def toggle_mute(event=None):
+    muted = audio.toggle_mute()
+    scheduler.update_widget(info_label, text="Sound off" if muted else "Sound on", fg="white")
+
+# Change the simulation speed multiplier (1 is normal speed, 0 uncapped)
+def set_turbo(multiplier):
+    global turbo, turbo_credit
+    turbo = multiplier
+    turbo_credit = 0.0
+    # A hunt paused on a shiny continues at the new speed
+    if scheduler.is_running("encounter"):
+        start_encounter_loop()
+    if turbo == 1:
+        text = "Turbo off"
+    elif turbo == 0:
+        text = "Turbo: uncapped"
+    else:
+        text = f"Turbo: {turbo:g}x"
+    scheduler.update_widget(info_label, text=text, fg="white")
+
+# Ctrl+T moves to the next turbo speed
+def cycle_turbo(event=None):
+    level = TURBO_LEVELS.index(turbo) + 1 if turbo in TURBO_LEVELS else 0
+    set_turbo(TURBO_LEVELS[level % len(TURBO_LEVELS)])
+
+# Switch the spawn table mid-hunt; samplers and backgrounds were prepared at startup
+def set_biome(biome_name):
+    global background_image
+    biome = biomes.switch(biome_name)
+    hunt.sampler = biome.sampler
+    # Encounters drawn ahead came from the previous biome
+    prefetcher.reset()
+    warm_working_set(biome)
+
+    background_path = biome_backgrounds[biome_name]
+    if background_path is not None:
+        background_image = background_photos.get(background_path)
+        if background_image is None:
+            background_image = background_photos[background_path] = ImageTk.PhotoImage(load_background(background_path))
+        canvas.itemconfigure(background_item, image=background_image)
+        canvas.tag_lower(background_item)
+        root.maxsize(background_image.width(), background_image.height())
+    scheduler.update_widget(info_label, text=f"Biome: {biome_name}", fg="white")
+
+# Ctrl+B moves to the next biome
+def cycle_biome(event=None):
+    set_biome(biomes.next_name())
+
+# With "biome": "auto", follow the biomes' hours
+def check_biome_hours():
+    biome_name = biomes.for_hour(time.localtime().tm_hour)
+    if biome_name != biomes.active.name:
+        set_biome(biome_name)
+
+# Resize every biome's background ahead of time so switching never waits on it
+def prepare_biome_backgrounds():
+    for background_path in set(biome_backgrounds.values()):
+        if background_path is not None:
+            try:
+                load_background(background_path)
+            except Exception as e:
+                logger.log_error(f"Error preparing background {background_path}: {str(e)}")
+
+# Follow the biomes' hours only with "biome": "auto"
+def schedule_biome_hours():
+    if config["biome"] == "auto" and len(biomes) > 1:
+        scheduler.every("biome", 60.0, check_biome_hours)
+    else:
+        scheduler.cancel("biome")
+
+# Apply an edited config.json, rebuilding only what the changed keys feed
+def apply_config_change(changed):
+    global encounter_delay, rarity_weights, shiny_rate, sprite_scale, biomes
+    applied = set()
+
+    # Build new spawn tables before touching anything, so a failure leaves the app as it was
+    new_biomes = None
+    if changed & {"rarity_weights", "biomes"}:
+        roster = data_manager.load_pokemon_data()
+        new_biomes = BiomeSet(
+            roster,
+            config["biomes"],
+            config["rarity_weights"],
+            default_sampler=SpeciesSampler.from_pokemon_data(roster, config["rarity_weights"])
+        )
+
+    if "encounter_delay" in changed:
+        encounter_delay = config["encounter_delay"]
+        # A hunt paused on a shiny picks up the new delay when continued
+        if scheduler.is_running("encounter"):
+            start_encounter_loop()
+        applied.add("encounter_delay")
+
+    if "turbo" in changed:
+        set_turbo(config["turbo"])
+        applied.add("turbo")
+
+    if "turbo_render_fps" in changed:
+        if scheduler.is_running("turbo_render"):
+            start_encounter_loop()
+        applied.add("turbo_render_fps")
+
+    if "shiny_rate" in changed:
+        shiny_rate = hunt.shiny_rate = config["shiny_rate"]
+        # Prefetched encounters were rolled at the old rate
+        prefetcher.reset()
+        applied.add("shiny_rate")
+
+    biome_keys = changed & {"rarity_weights", "biomes", "biome", "background_image"}
+    if biome_keys:
+        biome_name = biomes.active.name
+        if new_biomes is not None:
+            # The roster is already loaded; only the samplers were rebuilt
+            rarity_weights = config["rarity_weights"]
+            encounter_manager.set_rarity_weights(rarity_weights)
+            biomes = new_biomes
+        if biome_keys & {"biomes", "background_image"}:
+            resolve_biome_backgrounds()
+            threading.Thread(target=prepare_biome_backgrounds, daemon=True).start()
+
+        if "biome" in changed or biome_name not in biomes:
+            biome_name = config["biome"]
+            if biome_name == "auto":
+                biome_name = biomes.for_hour(time.localtime().tm_hour)
+            if biome_name not in biomes:
+                logger.log_error(f"Unknown biome {biome_name}, using the whole roster")
+                biome_name = "default"
+        set_biome(biome_name)
+        schedule_biome_hours()
+        applied |= biome_keys
+
+    if "mute_audio" in changed:
+        audio.set_muted(config["mute_audio"])
+        applied.add("mute_audio")
+
+    if "frame_cache_mb" in changed:
+        frame_cache.resize(config["frame_cache_mb"])
+        applied.add("frame_cache_mb")
+
+    if "asset_cache_mb" in changed:
+        asset_cache.resize(config["asset_cache_mb"])
+        applied.add("asset_cache_mb")
+
+    if "sprite_scale" in changed:
+        sprite_scale = config["sprite_scale"]
+        # Cached frames are at the old scale; the next encounter is drawn at the new one
+        frame_cache.clear()
+        prefetcher.reset()
+        warm_working_set(biomes.active)
+        applied.add("sprite_scale")
+
+    if "prefetch_depth" in changed:
+        prefetcher.depth = max(1, config["prefetch_depth"])
+        applied.add("prefetch_depth")
+
+    if "config_reload_interval" in changed:
+        schedule_config_watch()
+        applied.add("config_reload_interval")
+
+    # Only read at startup
+    applied |= changed & {"startup_timing", "offline_progress_max_hours"}
+
+    console.say(f"Reloaded config.json: {', '.join(sorted(applied)) or 'nothing to update'}")
+    if changed - applied:
+        console.say(f"Restart IdleMon to apply: {', '.join(sorted(changed - applied))}")
+
+config_watcher = ConfigWatcher(config, apply_config_change)
+
+def schedule_config_watch():
+    if config["config_reload_interval"] > 0:
+        scheduler.every("config", config["config_reload_interval"], config_watcher.poll)
+    else:
+        scheduler.cancel("config")
+
+# Runs once the first frame has been drawn
+def on_first_frame():
+    # Draw anything still pending so the mark covers the whole first frame
+    root.update_idletasks()
+    startup_timer.mark("first frame")
+    if config["startup_timing"]:
+        root.after_idle(startup_timer.report)
+    # Set by benchmarks/run.py: save the timings and quit
+    report_path = os.environ.get("IDLEMON_STARTUP_REPORT")
+    if report_path:
+        startup_timer.save(report_path)
+        root.after_idle(on_closing)
+
+# Expose cache and animation statistics alongside the hot-path timings
+metrics.gauge("idlemon_frame_cache_hits_total", "Frame cache hits", lambda: frame_cache.hits, kind="counter")
+metrics.gauge("idlemon_frame_cache_misses_total", "Frame cache misses", lambda: frame_cache.misses, kind="counter")
+metrics.gauge("idlemon_frame_cache_evictions_total", "Frame cache evictions", lambda: frame_cache.evictions,
+              kind="counter")
+metrics.gauge("idlemon_frame_cache_bytes", "Bytes held by the frame cache", lambda: frame_cache.stats()["bytes"])
+metrics.gauge("idlemon_dropped_frames_total", "Animation frames dropped", lambda: animator.dropped_frames,
+              kind="counter")
+metrics.gauge("idlemon_animation_fps", "Animation frames drawn per second", lambda: animator.stats()["fps"])
+start_from_config(config)
+
 # Initialize and start
+scheduler.on_visibility_change(on_visibility_change)
+root.bind("<Control-m>", toggle_mute)
+root.bind("<Control-b>", cycle_biome)
+root.bind("<Control-t>", cycle_turbo)
+if len(biomes) > 1:
+    threading.Thread(target=prepare_biome_backgrounds, daemon=True).start()
+    warm_working_set(biomes.active)
+schedule_biome_hours()
+schedule_config_watch()
+hunt.subscribe(on_hunt_event)
 initialize_shiny_count()
-initialize_timer()
-start_encounter_thread()
+if offline_progress is not None and offline_progress.encounters:
+    info_label.config(text=f"Away: {offline_progress.encounters:,} encounters, "
+                           f"{offline_progress.shiny_total} shiny")
+hunt.start()
+start_timer()
+start_encounter_loop()
+# Record that the app is open, so offline progress only counts time it was closed
+scheduler.every("heartbeat", HEARTBEAT_INTERVAL, store.touch)
+startup_timer.mark("widgets")
+root.after_idle(on_first_frame)
 
 # Handle window close
 def on_closing():
-    global timer_running
-    timer_running = False
-    pygame.mixer.quit()
+    hunt.stop_timer()
+    scheduler.shutdown()
+    stats = frame_cache.stats()
+    console.say(f"Frame cache: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['evictions']} evictions ({stats['bytes'] / 1048576:.1f} MB used)")
+    stats = asset_cache.stats()
+    console.say(f"Asset cache: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['bytes'] / 1048576:.1f} MB on disk)")
+    stats = animator.stats()
+    console.say(f"Animation: {stats['fps']:.1f} fps, {stats['frames_drawn']} frames drawn, "
+                f"{stats['dropped_frames']} dropped")
+    animator.stop_all()
+    store.touch()
+    store.close()
+    metrics.stop()
+    if encounter_log is not None:
+        encounter_log.close()
+    prefetcher.shutdown()
+    audio.shutdown()
+    # Write out queued console lines and errors before the process exits
+    console.close()
+    logger.shutdown()
     root.destroy()
 
 root.protocol("WM_DELETE_WINDOW", on_closing)
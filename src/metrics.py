@@ -0,0 +1,286 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket bounds (seconds), from microsecond draws to slow decodes
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Window over which counters report a per-second rate (seconds)
+RATE_WINDOW = 60
+
+
+class _NullTimer:
+    """Context manager used while metrics are disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started)
+        return False
+
+
+class Histogram:
+    """Cumulative timing histogram in the Prometheus style"""
+
+    def __init__(self, registry, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        if not self.registry.enabled:
+            return
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def time(self):
+        """Context manager timing its block (free while metrics are disabled)"""
+        if not self.registry.enabled:
+            return _NULL_TIMER
+        return _Timer(self)
+
+    def render(self):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{self.name}_bucket{{le="{bound:g}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {count}')
+        lines.append(f"{self.name}_sum {total:.6f}")
+        lines.append(f"{self.name}_count {count}")
+        return lines
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "count": self.count,
+                "sum": self.sum,
+                "buckets": dict(zip([f"{bound:g}" for bound in self.buckets] + ["+Inf"], self.counts)),
+            }
+
+
+class Counter:
+    """Monotonic counter that also reports its recent per-second rate"""
+
+    def __init__(self, registry, name, help_text):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        # [second, count] pairs for the last RATE_WINDOW seconds
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        if not self.registry.enabled:
+            return
+        second = int(time.monotonic())
+        with self._lock:
+            self.value += amount
+            if self._recent and self._recent[-1][0] == second:
+                self._recent[-1][1] += amount
+            else:
+                self._recent.append([second, amount])
+                while self._recent[0][0] <= second - RATE_WINDOW:
+                    self._recent.popleft()
+
+    def rate(self):
+        """Average increments per second over the last RATE_WINDOW seconds"""
+        cutoff = int(time.monotonic()) - RATE_WINDOW
+        with self._lock:
+            return sum(count for second, count in self._recent if second > cutoff) / RATE_WINDOW
+
+    @property
+    def rate_name(self):
+        return self.name[:-len("_total")] + "_per_second" if self.name.endswith("_total") else self.name + "_rate"
+
+    def render(self):
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} counter",
+            f"{self.name} {self.value}",
+            f"# HELP {self.rate_name} {self.help}, per second over the last {RATE_WINDOW}s",
+            f"# TYPE {self.rate_name} gauge",
+            f"{self.rate_name} {self.rate():.3f}",
+        ]
+
+    def snapshot(self):
+        return {"value": self.value, "per_second": self.rate()}
+
+
+class Gauge:
+    """Value read from a callback when metrics are collected"""
+
+    def __init__(self, name, help_text, read, kind="gauge"):
+        self.name = name
+        self.help = help_text
+        self.read = read
+        self.kind = kind
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", f"{self.name} {self.read():g}"]
+
+    def snapshot(self):
+        return {"value": self.read()}
+
+
+class MetricsRegistry:
+    """Opt-in hot-path instrumentation, off (and nearly free) until enabled"""
+
+    def __init__(self):
+        self.enabled = False
+        self._metrics = {}
+        self._server = None
+        self._snapshot_thread = None
+        self._snapshot_path = None
+        self._stopped = threading.Event()
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        return self._metrics.setdefault(name, Histogram(self, name, help_text, buckets))
+
+    def counter(self, name, help_text):
+        return self._metrics.setdefault(name, Counter(self, name, help_text))
+
+    def gauge(self, name, help_text, read, kind="gauge"):
+        """Expose read() as a metric; kind="counter" for values that only grow"""
+        self._metrics[name] = Gauge(name, help_text, read, kind)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                lines.append(f"# {metric.name} unavailable: {e}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        metrics = {}
+        for name, metric in list(self._metrics.items()):
+            try:
+                metrics[name] = metric.snapshot()
+            except Exception:
+                continue
+        return {"time": time.time(), "metrics": metrics}
+
+    def write_snapshot(self, path):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file, indent=2)
+        os.replace(temp_path, path)
+
+    # Serving
+    def start(self, port=None, snapshot_path=None, snapshot_interval=60.0):
+        """Enable collection, serve /metrics on localhost and write periodic snapshots"""
+        from logger import logger
+
+        self.enabled = True
+        if port:
+            registry = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = registry.render().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            try:
+                # Bound to localhost only; metrics are not meant to leave the machine
+                self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+                self._server.daemon_threads = True
+                threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+            except OSError as e:
+                logger.log_error(f"Could not serve metrics on port {port}: {str(e)}")
+                self._server = None
+
+        if snapshot_path:
+            def write_snapshots():
+                while not self._stopped.wait(snapshot_interval):
+                    try:
+                        self.write_snapshot(snapshot_path)
+                    except OSError as e:
+                        logger.log_error(f"Error writing metrics snapshot: {str(e)}")
+
+            self._snapshot_path = snapshot_path
+            self._snapshot_thread = threading.Thread(target=write_snapshots, name="metrics-snapshot", daemon=True)
+            self._snapshot_thread.start()
+
+    def stop(self):
+        """Stop serving and write a final snapshot"""
+        if not self.enabled:
+            return
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join(timeout=5)
+            self._snapshot_thread = None
+            try:
+                self.write_snapshot(self._snapshot_path)
+            except OSError:
+                pass
+
+
+def start_from_config(config):
+    """Start metrics if enabled in config.json"""
+    if config["metrics"]:
+        metrics.start(
+            port=config["metrics_port"],
+            snapshot_path=config["metrics_snapshot_file"],
+            snapshot_interval=config["metrics_snapshot_interval"]
+        )
+
+
+# Create global registry and the hot-path metrics
+metrics = MetricsRegistry()
+sampling_time = metrics.histogram("idlemon_sampling_seconds", "Time to draw one encounter")
+decode_time = metrics.histogram("idlemon_gif_decode_seconds", "Time to decode every frame of a GIF")
+render_time = metrics.histogram("idlemon_canvas_render_seconds", "Time to draw one animation frame")
+persistence_time = metrics.histogram("idlemon_persistence_write_seconds", "Time to write the journal or a snapshot")
+audio_time = metrics.histogram("idlemon_audio_play_seconds", "Time to start playing a sound")
+encounters = metrics.counter("idlemon_encounters_total", "Encounters rolled")
+shinies = metrics.counter("idlemon_shinies_total", "Shinies found")
@@ -0,0 +1,239 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Only numpy is imported at module level: worker processes re-import this
+# module, and must not load the config, roster or persistence store.
+
+# Trials per pool task; fixed so a seed reproduces the same result on any core count
+TASK_TRIALS = 1 << 22
+# Trials drawn per NumPy batch inside a task
+BATCH_TRIALS = 1 << 20
+# Histogram bins used to estimate percentiles without keeping every trial
+HISTOGRAM_BINS = 1 << 16
+
+PERCENTILES = (50, 75, 90, 95, 99, 99.9)
+# Two-sided 95% confidence
+Z_95 = 1.959963984540054
+
+
+def geometric_quantile(p, q):
+    """Exact q-quantile of the number of encounters until the first success"""
+    if p >= 1.0:
+        return 1
+    return max(1, math.ceil(math.log1p(-q) / math.log1p(-p)))
+
+
+def _run_trials(p, trials, bin_width, seed_sequence):
+    """Pool task: draw trials geometric waiting times and summarise them"""
+    rng = np.random.default_rng(seed_sequence)
+    histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+    total = 0.0
+    total_sq = 0.0
+    longest = 0
+    done = 0
+    while done < trials:
+        size = min(BATCH_TRIALS, trials - done)
+        waits = rng.geometric(p, size)
+        histogram += np.bincount(np.minimum((waits - 1) // bin_width, HISTOGRAM_BINS - 1),
+                                 minlength=HISTOGRAM_BINS)
+        as_float = waits.astype(np.float64)
+        total += float(as_float.sum())
+        total_sq += float(as_float @ as_float)
+        longest = max(longest, int(waits.max()))
+        done += size
+    return histogram, total, total_sq, longest
+
+
+class OddsResult:
+    def __init__(self, p, trials, bin_width, histogram, total, total_sq, longest, elapsed):
+        self.p = p
+        self.trials = trials
+        self.bin_width = bin_width
+        self.histogram = histogram
+        self.cumulative = np.cumsum(histogram)
+        self.total = total
+        self.total_sq = total_sq
+        self.longest = longest
+        self.elapsed = elapsed
+
+    @property
+    def mean(self):
+        return self.total / self.trials
+
+    def mean_interval(self):
+        """95% confidence interval for the mean number of encounters"""
+        variance = max(0.0, self.total_sq / self.trials - self.mean ** 2)
+        half_width = Z_95 * math.sqrt(variance / self.trials)
+        return self.mean - half_width, self.mean + half_width
+
+    def quantile(self, q):
+        """Encounters needed in a q share of trials (to within one histogram bin)"""
+        rank = min(self.trials, max(1, math.ceil(q * self.trials)))
+        index = int(np.searchsorted(self.cumulative, rank))
+        return (index + 1) * self.bin_width
+
+    def quantile_interval(self, q):
+        """95% confidence interval for a quantile, from the binomial spread of its rank"""
+        spread = Z_95 * math.sqrt(q * (1 - q) / self.trials)
+        return self.quantile(max(0.0, q - spread)), self.quantile(min(1.0, q + spread))
+
+    def to_dict(self, delay):
+        low, high = self.mean_interval()
+        return {
+            "probability": self.p,
+            "trials": self.trials,
+            "elapsed_seconds": self.elapsed,
+            "encounter_delay": delay,
+            "mean": {"encounters": self.mean, "ci95": [low, high], "seconds": self.mean * delay},
+            "expected": 1 / self.p,
+            "longest": self.longest,
+            "percentiles": {
+                str(pct): {
+                    "encounters": self.quantile(pct / 100),
+                    "ci95": list(self.quantile_interval(pct / 100)),
+                    "seconds": self.quantile(pct / 100) * delay,
+                }
+                for pct in PERCENTILES
+            },
+        }
+
+
+def estimate(p, trials, workers=None, seed=None):
+    """Run trials geometric waiting times with success chance p across a process pool"""
+    if not 0 < p <= 1:
+        raise ValueError("The target has zero probability with these settings")
+    if trials < 1:
+        raise ValueError("trials must be at least 1")
+
+    # Size the bins so nearly every trial lands in one, keeping percentiles exact for common targets
+    bin_width = max(1, math.ceil(geometric_quantile(p, 0.99999) / HISTOGRAM_BINS))
+    sizes = [TASK_TRIALS] * (trials // TASK_TRIALS)
+    if trials % TASK_TRIALS:
+        sizes.append(trials % TASK_TRIALS)
+    # Each task gets its own independent stream spawned from the one seed
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+    total = total_sq = 0.0
+    longest = 0
+    started = time.perf_counter()
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        run = pool.map if pool is not None else map
+        tasks = run(_run_trials, [p] * len(sizes), sizes, [bin_width] * len(sizes), seeds)
+        for task_histogram, task_total, task_sq, task_longest in tasks:
+            histogram += task_histogram
+            total += task_total
+            total_sq += task_sq
+            longest = max(longest, task_longest)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return OddsResult(p, trials, bin_width, histogram, total, total_sq, longest,
+                      time.perf_counter() - started)
+
+
+def format_duration(seconds):
+    """Readable wall-clock time, e.g. '3d 04h' or '12m 30s'"""
+    seconds = int(round(seconds))
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if days:
+        return f"{days}d {hours:02}h"
+    if hours:
+        return f"{hours}h {minutes:02}m"
+    return f"{minutes}m {seconds:02}s"
+
+
+def target_probability(simulator, species=None, variant="shiny"):
+    """Chance per encounter of the target; any shiny when no species is given"""
+    p_shiny = 1 / simulator.shiny_rate
+    if species is None:
+        return p_shiny
+    if species not in simulator.species:
+        raise ValueError(f"{species} is not in the roster")
+    p_species = float(simulator.probabilities[simulator.species.index(species)])
+    if variant == "shiny":
+        return p_species * p_shiny
+    if variant == "normal":
+        return p_species * (1 - p_shiny)
+    return p_species
+
+
+def print_report(result, description, delay):
+    print(f"Target: {description}")
+    print(f"Chance per encounter: 1 in {1 / result.p:,.1f}")
+    print(f"Ran {result.trials:,} trials in {result.elapsed:.2f}s "
+          f"({result.trials / max(result.elapsed, 1e-9):,.0f} trials/s)")
+
+    low, high = result.mean_interval()
+    print(f"\nMean: {result.mean:,.1f} encounters (95% CI {low:,.1f} - {high:,.1f}, "
+          f"exact {1 / result.p:,.1f}), about {format_duration(result.mean * delay)} "
+          f"at {delay:g}s per encounter")
+    print(f"\n{'Percentile':>10}  {'Encounters':>13}  {'95% CI':^29}  {'Time':>10}")
+    for pct in PERCENTILES:
+        value = result.quantile(pct / 100)
+        low, high = result.quantile_interval(pct / 100)
+        print(f"{pct:>9}%  {value:>13,}  {low:>13,} - {high:<13,}  {format_duration(value * delay):>10}")
+    print(f"\nLongest wait in {result.trials:,} trials: {result.longest:,} encounters "
+          f"({format_duration(result.longest * delay)})")
+
+
+def main(argv=None):
+    from simulator import config, create_simulator, parse_weight, positive_int
+
+    parser = argparse.ArgumentParser(description="Estimate encounters and time until a shiny or a species")
+    parser.add_argument("--species", default=None, help="target species (default: any shiny)")
+    parser.add_argument("--variant", choices=("shiny", "normal", "any"), default="shiny",
+                        help="which form of --species counts (default: shiny)")
+    parser.add_argument("-t", "--trials", type=positive_int, default=10_000_000,
+                        help="Monte Carlo trials (default: 10,000,000)")
+    parser.add_argument("--workers", type=positive_int, default=None,
+                        help="worker processes (default: one per CPU core)")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible runs")
+    parser.add_argument("--shiny-rate", type=positive_int, default=None,
+                        help="override the configured 1 in X shiny rate")
+    parser.add_argument("--weight", type=parse_weight, action="append", default=[],
+                        metavar="TIER=WEIGHT", help="override a rarity weight, e.g. 'Very Rare=2'")
+    parser.add_argument("--delay", type=float, default=None,
+                        help="seconds per encounter (default: encounter_delay from config.json)")
+    parser.add_argument("--json", metavar="PATH", help="write the result as JSON")
+    args = parser.parse_args(argv)
+
+    rarity_weights = {**config["rarity_weights"], **dict(args.weight)}
+    delay = config["encounter_delay"] if args.delay is None else args.delay
+    try:
+        simulator = create_simulator(rarity_weights, args.shiny_rate)
+        p = target_probability(simulator, args.species, args.variant)
+        result = estimate(p, args.trials, args.workers, args.seed)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.species is None:
+        description = "any shiny"
+    elif args.variant == "any":
+        description = f"{args.species} (normal or shiny)"
+    else:
+        description = f"{args.variant} {args.species}"
+    print_report(result, description, delay)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(dict(result.to_dict(delay), target=description), file, indent=2)
+        print(f"\nFull results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import time
+
+# How often a running hunt records that the app is open (seconds)
+HEARTBEAT_INTERVAL = 60.0
+
+
+class OfflineProgress:
+    """Encounters credited for the time the app was closed"""
+
+    def __init__(self, seconds, encounters, shinies):
+        self.seconds = seconds
+        self.encounters = encounters
+        # (name, rarity, count) for every species that came up shiny
+        self.shinies = shinies
+
+    @property
+    def shiny_total(self):
+        return sum(count for _, _, count in self.shinies)
+
+    def summary(self):
+        """One line describing the catch-up"""
+        hours, remainder = divmod(int(self.seconds), 3600)
+        text = f"While you were away ({hours}h {remainder // 60:02}m): {self.encounters:,} encounters"
+        if self.shinies:
+            found = ", ".join(f"{name} x{count}" if count > 1 else name for name, _, count in self.shinies)
+            text += f", {self.shiny_total} shiny: {found}"
+        return text
+
+
+def offline_encounters(last_seen, now, encounter_delay, max_hours=None):
+    """Return (seconds away, encounters that would have happened in that time)"""
+    if last_seen is None or encounter_delay <= 0:
+        return 0.0, 0
+    seconds = max(0.0, now - last_seen)
+    if max_hours is not None:
+        seconds = min(seconds, max_hours * 3600)
+    return seconds, int(seconds // encounter_delay)
+
+
+def catch_up(store, sampler, pokemon_data, shiny_rate, encounter_delay, max_hours=None, seed=None):
+    """Credit the encounters missed since the store was last seen
+
+    Instead of rolling every encounter, species counts are one multinomial
+    draw and shinies one binomial draw per species, so days away cost
+    milliseconds. Shinies go through the store like live ones; every shiny
+    counts, as if each hunt was continued straight away.
+    """
+    seconds, encounters = offline_encounters(store.last_seen, time.time(), encounter_delay, max_hours)
+    store.touch()
+    if encounters == 0:
+        return OfflineProgress(seconds, 0, [])
+
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    probabilities = np.asarray(sampler.probabilities, dtype=np.float64)
+    counts = rng.multinomial(encounters, probabilities / probabilities.sum())
+    shiny_counts = rng.binomial(counts, 1 / shiny_rate)
+
+    shinies = []
+    for index in np.flatnonzero(shiny_counts).tolist():
+        name = sampler.species[index]
+        rarity = pokemon_data[name]
+        count = int(shiny_counts[index])
+        for _ in range(count):
+            store.record_shiny(name, rarity)
+        shinies.append((name, rarity, count))
+
+    return OfflineProgress(seconds, encounters, shinies)
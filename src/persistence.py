@@ -0,0 +1,258 @@
+import atexit
+import base64
+import json
+import os
+import threading
+import time
+
+from config_loader import get_base_path
+from logger import logger
+from metrics import persistence_time
+
+# Journal entries written between snapshot compactions
+COMPACT_EVERY = 500
+
+
+def atomic_write(path, text):
+    """Write text to path via a temp file and rename, so readers never see a partial file"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+class PersistenceStore:
+    """Write-behind store for the shiny counter and shiny log
+
+    Events are kept in memory and appended to a journal on a background
+    thread every flush_interval seconds. The journal is periodically compacted
+    into a snapshot written by atomic rename, which also refreshes the
+    human-readable shiny_count.bin and shinies_encountered.txt files.
+    """
+
+    def __init__(self, logs_dir, flush_interval=5.0):
+        self.logs_dir = logs_dir
+        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshot_path = self.logs_dir / "state.json"
+        self.journal_path = self.logs_dir / "journal.log"
+        self.shiny_count_path = self.logs_dir / "shiny_count.bin"
+        self.shiny_log_path = self.logs_dir / "shinies_encountered.txt"
+        self.flush_interval = flush_interval
+
+        # In-memory state, the single source of truth while running
+        self.total_shiny = 0
+        self.shinies = {}  # name -> {'rarity': str, 'count': int}
+        self.last_seen = None
+        self._seq = 0
+        self._snapshot_seq = 0
+        self._journal_entries = 0
+
+        self._pending = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+        self._load()
+
+    # Loading and migration
+    def _load(self):
+        if not self.snapshot_path.exists() and not self.journal_path.exists():
+            self._migrate_legacy_files()
+            return
+
+        if self.snapshot_path.exists():
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as file:
+                    snapshot = json.load(file)
+                self.total_shiny = snapshot["total_shiny"]
+                self.shinies = snapshot["shinies"]
+                self.last_seen = snapshot.get("last_seen")
+                self._seq = self._snapshot_seq = snapshot["seq"]
+            except (OSError, ValueError, KeyError) as e:
+                logger.log_error(f"Error loading {self.snapshot_path}: {str(e)}")
+                print(f"Warning: {self.snapshot_path} is corrupted. Rebuilding from the journal.")
+
+        damaged = False
+        if self.journal_path.exists():
+            with open(self.journal_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-append; everything before it is intact
+                        logger.log_error(f"Skipping damaged journal entry: {line.strip()}")
+                        damaged = True
+                        continue
+                    self._journal_entries += 1
+                    # Entries already folded into the snapshot are skipped
+                    if event["seq"] > self._snapshot_seq:
+                        self._apply(event)
+                        self._seq = event["seq"]
+
+        # Start a clean journal so new entries are not appended to a torn line
+        if damaged:
+            self.compact()
+
+    def _migrate_legacy_files(self):
+        """Import shiny_count.bin and shinies_encountered.txt from older versions"""
+        if self.shiny_count_path.exists():
+            try:
+                with open(self.shiny_count_path, "r") as file:
+                    self.total_shiny = int(base64.b64decode(file.read().strip()).decode("utf-8"))
+            except (ValueError, base64.binascii.Error) as e:
+                logger.log_error(f"Error loading shiny count: {str(e)}")
+                print(f"Warning: {self.shiny_count_path} is corrupted. Resetting to 0.")
+
+        if self.shiny_log_path.exists():
+            with open(self.shiny_log_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        name, rarity, count = line.strip().split(' | ')
+                        self.shinies[name] = {'rarity': rarity, 'count': int(count)}
+                    except ValueError:
+                        logger.log_error(f"Invalid line in shiny log: {line.strip()}")
+
+        self.compact()
+
+    # Recording events (cheap, never touches the disk)
+    def _apply(self, event):
+        kind = event["type"]
+        if kind in ("shiny", "log"):
+            entry = self.shinies.setdefault(event["name"], {'rarity': event["rarity"], 'count': 0})
+            entry['count'] += 1
+        if kind == "shiny":
+            self.total_shiny += 1
+        elif kind == "count":
+            self.total_shiny = event["value"]
+        elif kind == "seen":
+            self.last_seen = event["time"]
+
+    def _record(self, event):
+        with self._lock:
+            self._seq += 1
+            event["seq"] = self._seq
+            self._apply(event)
+            self._pending.append(event)
+        self._ensure_thread()
+
+    def record_shiny(self, pokemon_name, rarity):
+        """Count a shiny and add it to the shiny log; returns the new total"""
+        self._record({"type": "shiny", "name": pokemon_name, "rarity": rarity})
+        return self.total_shiny
+
+    def log_shiny(self, pokemon_name, rarity):
+        """Add a shiny to the shiny log without touching the total"""
+        self._record({"type": "log", "name": pokemon_name, "rarity": rarity})
+
+    def set_shiny_count(self, count):
+        """Overwrite the total shiny count"""
+        self._record({"type": "count", "value": int(count)})
+
+    def touch(self):
+        """Record that the app was running now"""
+        self._record({"type": "seen", "time": time.time()})
+
+    # Background writing
+    def _ensure_thread(self):
+        if self._thread is None and not self._stopped:
+            self._thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Append pending events to the journal, compacting it when it grows"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        with self._io_lock:
+            try:
+                with persistence_time.time(), open(self.journal_path, "a", encoding="utf-8") as file:
+                    file.write("".join(json.dumps(event) + "\n" for event in pending))
+                    file.flush()
+                    os.fsync(file.fileno())
+                self._journal_entries += len(pending)
+            except OSError as e:
+                logger.log_error(f"Error writing journal: {str(e)}")
+                # Keep the events so the next flush retries them
+                with self._lock:
+                    self._pending[:0] = pending
+                return
+        if self._journal_entries >= COMPACT_EVERY:
+            self.compact()
+
+    def compact(self):
+        """Write a snapshot and the readable log files, then truncate the journal"""
+        with self._io_lock:
+            with self._lock:
+                # Unflushed events are included in the snapshot, and dropped from the
+                # queue once it is safely written
+                seq = self._seq
+                snapshot = {
+                    "seq": seq,
+                    "total_shiny": self.total_shiny,
+                    "shinies": {name: dict(data) for name, data in self.shinies.items()},
+                    "last_seen": self.last_seen,
+                }
+            try:
+                with persistence_time.time():
+                    atomic_write(self.snapshot_path, json.dumps(snapshot))
+                with self._lock:
+                    self._pending = [event for event in self._pending if event["seq"] > seq]
+                # A crash before truncation is harmless: replay skips entries <= seq
+                with open(self.journal_path, "w", encoding="utf-8"):
+                    pass
+                self._snapshot_seq = seq
+                self._journal_entries = 0
+
+                atomic_write(
+                    self.shiny_count_path,
+                    base64.b64encode(str(snapshot["total_shiny"]).encode("utf-8")).decode("utf-8")
+                )
+                atomic_write(self.shiny_log_path, "".join(
+                    f"{name} | {data['rarity']} | {data['count']}\n"
+                    for name, data in sorted(snapshot["shinies"].items())
+                ))
+            except OSError as e:
+                logger.log_error(f"Error compacting persistence store: {str(e)}")
+
+    def close(self):
+        """Stop the writer thread and persist everything"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.compact()
+
+
+# The app's store, created on first use so tools that never save progress
+# (the simulator, benchmarks, daemon --hunts) leave logs/ alone
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the store holding the app's progress in logs/, opening it on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                from config_loader import load_config
+                store = PersistenceStore(
+                    get_base_path()['data'] / "logs",
+                    flush_interval=load_config()["persistence_flush_interval"]
+                )
+                atexit.register(store.close)
+                _store = store
+    return _store
@@ -0,0 +1,98 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from sprite_loader import decode_gif_frames
+
+
+class PendingEncounter:
+    """An encounter drawn ahead of time, with its sprite decode in flight"""
+
+    def __init__(self, pokemon_name, is_shiny, future):
+        self.pokemon_name = pokemon_name
+        self.is_shiny = is_shiny
+        self.future = future
+
+    def result(self, timeout=None):
+        """Wait for the decoded sprite (None if cached or not found)"""
+        if self.future is None:
+            return None
+        return self.future.result(timeout)
+
+
+class EncounterPrefetcher:
+    """Picks the next encounters in advance and decodes their sprites on a thread pool"""
+
+    def __init__(self, draw_encounter, find_sprite, depth=4, workers=2, frame_cache=None, decode=decode_gif_frames):
+        # draw_encounter() -> (pokemon_name, is_shiny)
+        # find_sprite(pokemon_name, is_shiny) -> path or file object, None if missing
+        # decode(sprite) -> DecodedSprite
+        self.draw_encounter = draw_encounter
+        self.find_sprite = find_sprite
+        self.decode = decode
+        self.depth = max(1, depth)
+        self.frame_cache = frame_cache
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="sprite-decode")
+
+    def _decode(self, pokemon_name, is_shiny):
+        sprite = self.find_sprite(pokemon_name, is_shiny)
+        if sprite is None:
+            return None
+        return self.decode(sprite)
+
+    def _fill(self):
+        while len(self._queue) < self.depth:
+            pokemon_name, is_shiny = self.draw_encounter()
+            # Sprites already in the frame cache need no decoding
+            if self.frame_cache is not None and (pokemon_name, is_shiny) in self.frame_cache:
+                future = None
+            else:
+                future = self._executor.submit(self._decode, pokemon_name, is_shiny)
+            self._queue.append(PendingEncounter(pokemon_name, is_shiny, future))
+
+    def next_encounter(self):
+        """Return the oldest prefetched encounter and queue a new one behind it"""
+        with self._lock:
+            self._fill()
+            pending = self._queue.popleft()
+            self._fill()
+            return pending
+
+    def request(self, pokemon_name, is_shiny):
+        """Decode the sprite of an encounter drawn elsewhere (e.g. in a fast-forward batch)"""
+        if self.frame_cache is not None and (pokemon_name, is_shiny) in self.frame_cache:
+            return PendingEncounter(pokemon_name, is_shiny, None)
+        return PendingEncounter(pokemon_name, is_shiny, self._executor.submit(self._decode, pokemon_name, is_shiny))
+
+    def warm(self, sprites):
+        """Decode (pokemon_name, is_shiny) sprites in the background, skipping those in the frame cache
+
+        Returns a PendingEncounter per sprite submitted, for the caller to
+        cache once decoded.
+        """
+        pending = []
+        for pokemon_name, is_shiny in sprites:
+            if self.frame_cache is not None and (pokemon_name, is_shiny) in self.frame_cache:
+                continue
+            future = self._executor.submit(self._decode, pokemon_name, is_shiny)
+            pending.append(PendingEncounter(pokemon_name, is_shiny, future))
+        return pending
+
+    def reset(self):
+        """Discard encounters drawn with outdated settings"""
+        with self._lock:
+            for pending in self._queue:
+                if pending.future is not None:
+                    pending.future.cancel()
+            self._queue.clear()
+
+    def shutdown(self):
+        """Stop the decode pool without waiting for queued work"""
+        self.reset()
+        try:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        except TypeError:
+            # cancel_futures needs Python 3.9+
+            self._executor.shutdown(wait=False)
@@ -0,0 +1,96 @@
+import random
+
+from species_table import SpeciesTable
+
+
+class SpeciesSampler:
+    """Weighted species sampler using Vose's alias method (O(1) per draw)"""
+
+    def __init__(self, species, weights):
+        self.species = list(species)
+        weights = [float(w) for w in weights]
+        if len(weights) != len(self.species):
+            raise ValueError("species and weights must have the same length")
+        total = sum(weights)
+        if not self.species or total <= 0:
+            raise ValueError("Roster has no species with a positive spawn weight")
+        if any(w < 0 for w in weights):
+            raise ValueError("Spawn weights must not be negative")
+
+        n = len(weights)
+        self.size = n
+        self.probabilities = [w / total for w in weights]
+        self.prob, self.alias = self._build_alias_table(self.probabilities)
+        self._np_tables = None
+
+    @classmethod
+    def from_pokemon_data(cls, pokemon_data, rarity_weights):
+        """Build a sampler from a name -> rarity roster and rarity weights"""
+        if isinstance(pokemon_data, SpeciesTable):
+            # Indices are the table's species ids
+            return cls(pokemon_data.names, pokemon_data.weights(rarity_weights))
+        return cls(
+            pokemon_data.keys(),
+            [rarity_weights.get(rarity, 0) for rarity in pokemon_data.values()]
+        )
+
+    @staticmethod
+    def _build_alias_table(probabilities):
+        """Split each slot between itself and one alias so every slot sums to 1/n"""
+        n = len(probabilities)
+        scaled = [p * n for p in probabilities]
+        prob = [0.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Leftovers are 1.0 up to floating point error
+        for i in large + small:
+            prob[i] = 1.0
+        return prob, alias
+
+    def draw_index(self, rng=random):
+        """Draw one species index"""
+        u = rng.random() * self.size
+        i = min(int(u), self.size - 1)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+    def draw(self, rng=random):
+        """Draw one species name"""
+        return self.species[self.draw_index(rng)]
+
+    def draw_indices(self, k, rng=random):
+        """Draw k species indices"""
+        draw_index = self.draw_index
+        return [draw_index(rng) for _ in range(k)]
+
+    def draw_many(self, k, rng=random):
+        """Draw k species names"""
+        species = self.species
+        return [species[i] for i in self.draw_indices(k, rng)]
+
+    def draw_array(self, size, np_rng):
+        """Draw a NumPy array of species indices using a NumPy Generator"""
+        import numpy as np
+
+        if self._np_tables is None:
+            self._np_tables = (
+                np.array(self.prob, dtype=np.float64),
+                np.array(self.alias, dtype=np.intp)
+            )
+        prob, alias = self._np_tables
+
+        u = np_rng.random(size) * self.size
+        idx = np.minimum(u.astype(np.intp), self.size - 1)
+        return np.where(u - idx < prob[idx], idx, alias[idx])
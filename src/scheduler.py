@@ -0,0 +1,140 @@
+import time
+
+from logger import logger
+
+# Interval between coalesced widget updates (ms), about one per display frame
+UI_FRAME_MS = 16
+
+
+class PeriodicJob:
+    """A callback run on the Tk event loop at fixed, drift-free deadlines"""
+
+    def __init__(self, scheduler, name, interval, callback, pause_when_hidden):
+        self.scheduler = scheduler
+        self.name = name
+        self.interval = interval
+        self.callback = callback
+        self.pause_when_hidden = pause_when_hidden
+        self.next_deadline = time.monotonic() + interval
+        self.after_id = None
+
+    def _schedule(self):
+        delay = max(0.0, self.next_deadline - time.monotonic())
+        self.after_id = self.scheduler.root.after(int(delay * 1000), self._run)
+
+    def _run(self):
+        self.after_id = None
+        if self.pause_when_hidden and self.scheduler.hidden:
+            # Resumed by the scheduler when the window is shown again
+            return
+
+        try:
+            self.callback()
+        except Exception as e:
+            # A failing tick must not silently end the job while is_running() says otherwise
+            logger.log_error("Error in scheduled job", job=self.name, error=str(e))
+
+        # The callback may have cancelled this job
+        if self.scheduler._jobs.get(self.name) is not self:
+            return
+
+        # Deadlines advance by whole intervals so ticks don't drift; ticks
+        # missed while the loop was blocked are skipped instead of bunched up
+        now = time.monotonic()
+        self.next_deadline += self.interval
+        if self.next_deadline < now:
+            missed = int((now - self.next_deadline) // self.interval) + 1
+            self.next_deadline += missed * self.interval
+        self._schedule()
+
+    def cancel(self):
+        if self.after_id is not None:
+            self.scheduler.root.after_cancel(self.after_id)
+            self.after_id = None
+
+
+class TkScheduler:
+    """Single-threaded scheduler built on root.after, with coalesced widget updates"""
+
+    def __init__(self, root):
+        self.root = root
+        self.hidden = False
+        self._jobs = {}
+        self._pending_updates = {}
+        self._flush_id = None
+        self._visibility_callbacks = []
+
+        # Track when the main window is minimized or restored
+        root.bind("<Unmap>", self._on_unmap, add="+")
+        root.bind("<Map>", self._on_map, add="+")
+
+    def every(self, name, interval, callback, pause_when_hidden=False):
+        """Run callback every interval seconds, replacing any job with the same name"""
+        self.cancel(name)
+        job = PeriodicJob(self, name, interval, callback, pause_when_hidden)
+        self._jobs[name] = job
+        if not (pause_when_hidden and self.hidden):
+            job._schedule()
+        return job
+
+    def cancel(self, name):
+        """Stop a periodic job"""
+        job = self._jobs.pop(name, None)
+        if job is not None:
+            job.cancel()
+
+    def is_running(self, name):
+        return name in self._jobs
+
+    def update_widget(self, widget, **options):
+        """Queue widget.config(**options); repeated updates within a frame collapse into one"""
+        self._pending_updates.setdefault(widget, {}).update(options)
+        if self._flush_id is None and not self.hidden:
+            self._flush_id = self.root.after(UI_FRAME_MS, self._flush)
+
+    def _flush(self):
+        self._flush_id = None
+        updates, self._pending_updates = self._pending_updates, {}
+        for widget, options in updates.items():
+            widget.config(**options)
+
+    def on_visibility_change(self, callback):
+        """Register callback(visible) for when the window is minimized or restored"""
+        self._visibility_callbacks.append(callback)
+
+    def _on_unmap(self, event):
+        # Child widgets share the root's bindings; only react to the window itself
+        if event.widget is not self.root or self.hidden:
+            return
+        self.hidden = True
+        if self._flush_id is not None:
+            self.root.after_cancel(self._flush_id)
+            self._flush_id = None
+        for job in self._jobs.values():
+            if job.pause_when_hidden:
+                job.cancel()
+        for callback in self._visibility_callbacks:
+            callback(False)
+
+    def _on_map(self, event):
+        if event.widget is not self.root or not self.hidden:
+            return
+        self.hidden = False
+        now = time.monotonic()
+        for job in self._jobs.values():
+            if job.pause_when_hidden and job.after_id is None:
+                job.next_deadline = now
+                job._schedule()
+        if self._pending_updates:
+            self._flush_id = self.root.after_idle(self._flush)
+        for callback in self._visibility_callbacks:
+            callback(True)
+
+    def shutdown(self):
+        """Cancel every job and pending update"""
+        for name in list(self._jobs):
+            self.cancel(name)
+        if self._flush_id is not None:
+            self.root.after_cancel(self._flush_id)
+            self._flush_id = None
+        self._pending_updates.clear()
@@ -0,0 +1,229 @@
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from data_manager import config
+from encounter_manager import EncounterManager
+
+# Encounters rolled per NumPy batch (bounds peak memory to a few hundred MB)
+DEFAULT_CHUNK_SIZE = 1 << 22
+
+
+class SimulationResult:
+    def __init__(self, species, rarities, counts, shiny_counts, shiny_gaps,
+                 total_encounters, encounters_since_shiny, elapsed):
+        # Per-species arrays share the roster order
+        self.species = species
+        self.rarities = rarities
+        self.counts = counts
+        self.shiny_counts = shiny_counts
+        # Encounters between consecutive shinies (first gap counts from the start)
+        self.shiny_gaps = shiny_gaps
+        self.total_encounters = total_encounters
+        self.encounters_since_shiny = encounters_since_shiny
+        self.elapsed = elapsed
+
+    @property
+    def shiny_hits(self):
+        return int(self.shiny_counts.sum())
+
+    def rarity_counts(self):
+        """Sum encounter counts per rarity tier"""
+        totals = {}
+        for rarity, count in zip(self.rarities, self.counts.tolist()):
+            totals[rarity] = totals.get(rarity, 0) + count
+        return totals
+
+    def gap_stats(self):
+        """Summarise the encounter gaps between shinies"""
+        if len(self.shiny_gaps) == 0:
+            return {}
+        gaps = self.shiny_gaps
+        return {
+            "mean": float(gaps.mean()),
+            "median": float(np.median(gaps)),
+            "p90": float(np.percentile(gaps, 90)),
+            "min": int(gaps.min()),
+            "max": int(gaps.max()),
+        }
+
+    def to_dict(self):
+        """Return a JSON serialisable view of the result"""
+        return {
+            "total_encounters": self.total_encounters,
+            "shiny_hits": self.shiny_hits,
+            "encounters_since_shiny": self.encounters_since_shiny,
+            "elapsed_seconds": self.elapsed,
+            "rarity_counts": self.rarity_counts(),
+            "shiny_gap_stats": self.gap_stats(),
+            "shiny_gaps": self.shiny_gaps.tolist(),
+            "species": {
+                name: {"rarity": rarity, "count": count, "shiny": shiny}
+                for name, rarity, count, shiny in zip(
+                    self.species, self.rarities,
+                    self.counts.tolist(), self.shiny_counts.tolist()
+                )
+            },
+        }
+
+
+class EncounterSimulator:
+    def __init__(self, pokemon_data, sampler, shiny_rate, seed=None):
+        # Roster order is shared with the sampler, so every array lines up with it
+        self.species = sampler.species
+        self.rarities = [pokemon_data[name] for name in self.species]
+        self.sampler = sampler
+        self.shiny_rate = int(shiny_rate)
+        if self.shiny_rate < 1:
+            raise ValueError("shiny_rate must be at least 1")
+
+        # Expected share per species
+        self.probabilities = np.array(sampler.probabilities, dtype=np.float64)
+        self.rng = np.random.default_rng(seed)
+
+    def draw_species(self, size):
+        """Draw a batch of species indices"""
+        return self.sampler.draw_array(size, self.rng)
+
+    def draw_shiny(self, size):
+        """Draw a batch of shiny flags, matching randint(1, shiny_rate) == 1"""
+        return self.rng.integers(1, self.shiny_rate + 1, size=size) == 1
+
+    def run(self, n_encounters, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Simulate n_encounters rolls and aggregate the results"""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        n_species = len(self.species)
+        counts = np.zeros(n_species, dtype=np.int64)
+        shiny_counts = np.zeros(n_species, dtype=np.int64)
+        gaps = []
+        last_shiny = 0
+        done = 0
+
+        started = time.perf_counter()
+        while done < n_encounters:
+            size = min(chunk_size, n_encounters - done)
+            species_idx = self.draw_species(size)
+            shiny_mask = self.draw_shiny(size)
+
+            counts += np.bincount(species_idx, minlength=n_species)
+
+            # Encounter numbers (1-based, global) of this batch's shinies
+            shiny_at = np.flatnonzero(shiny_mask) + done + 1
+            if shiny_at.size:
+                shiny_counts += np.bincount(species_idx[shiny_mask], minlength=n_species)
+                gaps.append(np.diff(shiny_at, prepend=last_shiny))
+                last_shiny = int(shiny_at[-1])
+            done += size
+
+        return SimulationResult(
+            species=self.species,
+            rarities=self.rarities,
+            counts=counts,
+            shiny_counts=shiny_counts,
+            shiny_gaps=np.concatenate(gaps) if gaps else np.zeros(0, dtype=np.int64),
+            total_encounters=n_encounters,
+            encounters_since_shiny=n_encounters - last_shiny,
+            elapsed=time.perf_counter() - started,
+        )
+
+
+def create_simulator(rarity_weights=None, shiny_rate=None, seed=None):
+    """Build a simulator from the configured roster, rarity weights and shiny rate"""
+    encounter_manager = EncounterManager(config)
+    if rarity_weights is not None:
+        encounter_manager.set_rarity_weights(rarity_weights)
+    pokemon_data = encounter_manager.data_manager.load_pokemon_data()
+    return EncounterSimulator(
+        pokemon_data,
+        encounter_manager.get_sampler(pokemon_data),
+        shiny_rate if shiny_rate is not None else encounter_manager.shiny_rate,
+        seed=seed
+    )
+
+
+def print_report(result, simulator, top=10):
+    """Print a readable summary of a simulation run"""
+    total = result.total_encounters
+    print(f"Simulated {total:,} encounters in {result.elapsed:.2f}s "
+          f"({total / max(result.elapsed, 1e-9):,.0f} encounters/s)")
+
+    # Observed vs expected share per rarity tier
+    expected = {}
+    for rarity, p in zip(simulator.rarities, simulator.probabilities.tolist()):
+        expected[rarity] = expected.get(rarity, 0.0) + p
+    print("\nRarity tier      Encounters      Observed   Expected")
+    for rarity, count in sorted(result.rarity_counts().items(), key=lambda item: -item[1]):
+        print(f"{rarity:<14} {count:>13,}   {count / total:>8.4%}   {expected[rarity]:>8.4%}")
+
+    print(f"\nShiny hits: {result.shiny_hits:,} (expected {total / simulator.shiny_rate:,.1f})")
+    stats = result.gap_stats()
+    if stats:
+        print(f"Encounters between shinies: mean {stats['mean']:,.1f}, median {stats['median']:,.0f}, "
+              f"p90 {stats['p90']:,.0f}, min {stats['min']:,}, max {stats['max']:,}")
+
+    if top:
+        order = np.argsort(result.counts)[::-1][:top]
+        print(f"\nTop {len(order)} species:")
+        for i in order:
+            print(f"  {result.species[i]:<14} {result.rarities[i]:<12} "
+                  f"{int(result.counts[i]):>13,}  shiny {int(result.shiny_counts[i]):,}")
+
+
+def parse_weight(value):
+    """Parse a TIER=WEIGHT override from the command line"""
+    try:
+        rarity, weight = value.rsplit("=", 1)
+        return rarity, float(weight)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected TIER=WEIGHT, got {value!r}")
+
+
+def positive_int(value):
+    """Parse a whole number of at least 1 from the command line"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected a whole number, got {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"Expected at least 1, got {number}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate IdleMon encounters without the GUI")
+    parser.add_argument("-n", "--encounters", type=positive_int, default=1_000_000,
+                        help="number of encounters to roll (default: 1,000,000)")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible runs")
+    parser.add_argument("--shiny-rate", type=positive_int, default=None,
+                        help="override the configured 1 in X shiny rate")
+    parser.add_argument("--weight", type=parse_weight, action="append", default=[],
+                        metavar="TIER=WEIGHT", help="override a rarity weight, e.g. 'Very Rare=2'")
+    parser.add_argument("--chunk-size", type=positive_int, default=DEFAULT_CHUNK_SIZE,
+                        help="encounters rolled per batch")
+    parser.add_argument("--top", type=int, default=10, help="number of species to list")
+    parser.add_argument("--json", metavar="PATH", help="write the full result as JSON")
+    args = parser.parse_args(argv)
+
+    rarity_weights = {**config["rarity_weights"], **dict(args.weight)}
+    try:
+        simulator = create_simulator(rarity_weights, args.shiny_rate, args.seed)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    result = simulator.run(args.encounters, chunk_size=args.chunk_size)
+    print_report(result, simulator, top=args.top)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result.to_dict(), file, indent=2)
+        print(f"\nFull results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
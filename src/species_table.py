@@ -0,0 +1,206 @@
+import json
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from enum import IntEnum
+
+from logger import logger
+
+# Table layout: magic, species count, header length, JSON header
+# (generation labels and source file hashes), then the rarity column,
+# the generation column and the names separated by newlines
+TABLE_MAGIC = b"IDLMSPC1"
+TABLE_VERSION = 1
+HEADER = struct.Struct("<8sII")
+
+
+class Rarity(IntEnum):
+    VERY_COMMON = 0
+    COMMON = 1
+    SEMI_RARE = 2
+    RARE = 3
+    VERY_RARE = 4
+
+    @property
+    def label(self):
+        """Name as written in the roster files and config.json"""
+        return RARITY_LABELS[self]
+
+    @classmethod
+    def parse(cls, label):
+        """Rarity for a roster label such as "Semi-rare" (ValueError if unknown)"""
+        try:
+            return cls(_RARITY_CODES[label])
+        except KeyError:
+            raise ValueError(f"Unknown rarity: {label!r}") from None
+
+
+RARITY_LABELS = ("Very Common", "Common", "Semi-rare", "Rare", "Very Rare")
+# Column code for a label or a Rarity (which hashes like its int value)
+_RARITY_CODES = {**{label: code for code, label in enumerate(RARITY_LABELS)}, **{code: code for code in Rarity}}
+
+
+class SpeciesTable(Mapping):
+    """Compiled roster: species ids are row numbers into compact columns
+
+    Reads like the old name -> rarity dict (values are the rarity labels),
+    so existing callers keep working, while the columns hold one byte per
+    species for rarity and generation. Names are interned and looked up
+    through a single name -> id dict. Species ids match the index order
+    of a SpeciesSampler built from the table.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.rarities = array("B")
+        self.generations = array("B")
+        # Generation labels ("gen1", ...) indexed by the generation column
+        self.generation_labels = []
+        # (name, generation kept, generation skipped) for repeated names
+        self.duplicates = []
+        self._ids = {}
+        self._generation_codes = {}
+
+    # Mapping interface (name -> rarity label)
+    def __getitem__(self, name):
+        return RARITY_LABELS[self.rarities[self._ids[name]]]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    # Building
+    def add(self, name, rarity, generation):
+        """Append a species and return its id
+
+        A name already in the table keeps its first entry; the repeat is
+        recorded in duplicates and None is returned.
+        """
+        try:
+            rarity_code = _RARITY_CODES[rarity]
+        except KeyError:
+            raise ValueError(f"Unknown rarity: {rarity!r}") from None
+        generation_code = self._generation_codes.get(generation)
+        if generation_code is None:
+            generation_code = self._generation_codes[generation] = len(self.generation_labels)
+            self.generation_labels.append(generation)
+
+        name = sys.intern(name)
+        species_id = len(self.names)
+        existing = self._ids.setdefault(name, species_id)
+        if existing != species_id:
+            self.duplicates.append((name, self.generation_of(existing), generation))
+            return None
+        self.names.append(name)
+        self.rarities.append(rarity_code)
+        self.generations.append(generation_code)
+        return species_id
+
+    # Lookups
+    def id_of(self, name):
+        """Species id for name (KeyError if unknown)"""
+        return self._ids[name]
+
+    def get_id(self, name, default=None):
+        return self._ids.get(name, default)
+
+    def name_of(self, species_id):
+        return self.names[species_id]
+
+    def rarity_of(self, species_id):
+        return Rarity(self.rarities[species_id])
+
+    def generation_of(self, species_id):
+        return self.generation_labels[self.generations[species_id]]
+
+    def weights(self, rarity_weights):
+        """Spawn weight of every species, in id order, from rarity label -> weight"""
+        by_code = [rarity_weights.get(label, 0) for label in RARITY_LABELS]
+        return [by_code[code] for code in self.rarities]
+
+    def to_arrays(self):
+        """(rarities, generations) as NumPy uint8 arrays sharing the table's memory"""
+        import numpy as np
+
+        return np.frombuffer(self.rarities, dtype=np.uint8), np.frombuffer(self.generations, dtype=np.uint8)
+
+    # Serialisation
+    def save(self, path, sources=None):
+        """Write the table as a binary file; sources identifies the roster files it came from"""
+        header = json.dumps({
+            "version": TABLE_VERSION,
+            "generations": self.generation_labels,
+            "sources": sources or {},
+        }).encode("utf-8")
+        temp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(temp_path, "wb") as file:
+                file.write(HEADER.pack(TABLE_MAGIC, len(self.names), len(header)))
+                file.write(header)
+                file.write(self.rarities.tobytes())
+                file.write(self.generations.tobytes())
+                file.write("\n".join(self.names).encode("utf-8"))
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.log_error(f"Error saving species table {path}: {str(e)}")
+
+    @classmethod
+    def load(cls, path, sources=None):
+        """Read a table saved by save(), or None if it is missing, unreadable or
+        was built from different roster files than sources"""
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            magic, count, header_length = HEADER.unpack_from(data)
+            if magic != TABLE_MAGIC:
+                return None
+            offset = HEADER.size
+            header = json.loads(data[offset:offset + header_length])
+            if header.get("version") != TABLE_VERSION:
+                return None
+            if sources is not None and header.get("sources") != sources:
+                return None
+            offset += header_length
+            table = cls()
+            table.rarities = array("B", data[offset:offset + count])
+            table.generations = array("B", data[offset + count:offset + 2 * count])
+            names = data[offset + 2 * count:].decode("utf-8").split("\n") if count else []
+        except (OSError, ValueError, struct.error):
+            return None
+        if len(names) != count or len(table.rarities) != count or len(table.generations) != count:
+            return None
+
+        table.names = [sys.intern(name) for name in names]
+        table._ids = dict(zip(table.names, range(count)))
+        table.generation_labels = list(header["generations"])
+        table._generation_codes = {label: code for code, label in enumerate(table.generation_labels)}
+        return table
+
+
+def main():
+    """Print a summary of the roster"""
+    from collections import Counter
+    from config_loader import load_config
+    from data_manager import DataManager
+
+    table = DataManager(load_config()).load_pokemon_data()
+    print(f"{len(table):,} species")
+    for code, label in enumerate(table.generation_labels):
+        print(f"  {label:<8} {table.generations.count(code):>8,}")
+    for rarity, count in sorted(Counter(table.rarities).items()):
+        print(f"  {RARITY_LABELS[rarity]:<12} {count:>8,}")
+    for name, kept, skipped in table.duplicates:
+        print(f"Duplicate: {name} in {skipped} (kept {kept})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
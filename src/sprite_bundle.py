@@ -0,0 +1,187 @@
+import argparse
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+
+from config_loader import PROJECT_ROOT
+from logger import logger
+
+# Bundle layout: magic, index length, JSON index, then the GIF blobs
+# (entry offsets are relative to the start of the blob section)
+BUNDLE_MAGIC = b"IDLMSPR1"
+BUNDLE_VERSION = 1
+HEADER = struct.Struct("<8sI")
+
+DEFAULT_BUNDLE_PATH = PROJECT_ROOT['runtime'] / "assets" / "sprites.bundle"
+
+
+class BundleEntry:
+    """Location and metadata of one sprite inside the bundle"""
+
+    __slots__ = ("name", "is_shiny", "generation", "offset", "length", "width", "height", "durations")
+
+    def __init__(self, name, is_shiny, generation, offset, length, width, height, durations):
+        self.name = name
+        self.is_shiny = is_shiny
+        self.generation = generation
+        self.offset = offset
+        self.length = length
+        self.width = width
+        self.height = height
+        self.durations = durations
+
+
+class _BundleReader(io.RawIOBase):
+    """Read-only file object over a slice of the mapped bundle (no up-front copy)"""
+
+    def __init__(self, view):
+        self._view = view
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), len(self._view) - self._pos)
+        if size <= 0:
+            return 0
+        buffer[:size] = self._view[self._pos:self._pos + size]
+        self._pos += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = len(self._view) + offset
+        self._pos = max(0, self._pos)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+class SpriteBundle:
+    """Memory-mapped pack of every sprite, read by offset"""
+
+    def __init__(self, bundle_path):
+        self.bundle_path = Path(bundle_path)
+        self._file = open(self.bundle_path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+            magic, index_length = HEADER.unpack_from(self._mmap, 0)
+            if magic != BUNDLE_MAGIC:
+                raise ValueError(f"{self.bundle_path} is not a sprite bundle")
+            index = json.loads(bytes(self._view[HEADER.size:HEADER.size + index_length]).decode("utf-8"))
+            self._data_start = HEADER.size + index_length
+            if index.get("version") != BUNDLE_VERSION:
+                raise ValueError(f"Unsupported sprite bundle version {index.get('version')}")
+        except Exception:
+            self.close()
+            raise
+
+        self.entries = {}
+        for item in index["sprites"]:
+            entry = BundleEntry(**item)
+            self.entries[(entry.name, entry.is_shiny)] = entry
+
+    @classmethod
+    def open_default(cls, bundle_path=DEFAULT_BUNDLE_PATH):
+        """Open the bundle if it exists and is valid, otherwise return None"""
+        if not os.path.exists(bundle_path):
+            return None
+        try:
+            return cls(bundle_path)
+        except (OSError, ValueError) as e:
+            logger.log_error(f"Error opening sprite bundle {bundle_path}: {str(e)}")
+            print(f"Warning: could not open {bundle_path}, using loose GIF files")
+            return None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def open_sprite(self, pokemon_name, is_shiny=False):
+        """Return a file object over one sprite's GIF data, or None"""
+        entry = self.entries.get((pokemon_name, is_shiny))
+        if entry is None:
+            return None
+        start = self._data_start + entry.offset
+        return _BundleReader(self._view[start:start + entry.length])
+
+    def close(self):
+        # Views must be released before the map can be closed
+        if getattr(self, "_view", None) is not None:
+            self._view.release()
+            self._view = None
+        if getattr(self, "_mmap", None) is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A reader still holds a slice; the map is freed with it
+                pass
+            self._mmap = None
+        self._file.close()
+
+
+def build_bundle(gifs_dir, output_path):
+    """Pack every indexed GIF into a single bundle file (written atomically)"""
+    from sprite_index import SpriteIndex, read_gif_metadata
+
+    sprite_index = SpriteIndex(gifs_dir).build()
+    items = []
+    blobs = []
+    offset = 0
+    for (name, is_shiny), info in sorted(sprite_index.items()):
+        with open(info.path, "rb") as file:
+            data = file.read()
+        width, height, durations = read_gif_metadata(info.path)
+        items.append({
+            "name": name,
+            "is_shiny": is_shiny,
+            "generation": info.generation,
+            "offset": offset,
+            "length": len(data),
+            "width": width,
+            "height": height,
+            "durations": durations,
+        })
+        blobs.append(data)
+        offset += len(data)
+
+    index = json.dumps({"version": BUNDLE_VERSION, "sprites": items}, ensure_ascii=False).encode("utf-8")
+
+    output_path = Path(output_path)
+    temp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(BUNDLE_MAGIC, len(index)))
+        file.write(index)
+        for blob in blobs:
+            file.write(blob)
+    os.replace(temp_path, output_path)
+    return len(items), output_path.stat().st_size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack the IdleMon sprites into a single bundle file")
+    parser.add_argument("--gifs-dir", default=str(PROJECT_ROOT['runtime'] / "assets" / "gifs"),
+                        help="directory holding gen*/normal and gen*/shiny")
+    parser.add_argument("--output", default=str(DEFAULT_BUNDLE_PATH), help="bundle file to write")
+    args = parser.parse_args(argv)
+
+    count, size = build_bundle(args.gifs_dir, args.output)
+    print(f"Packed {count} sprites into {args.output} ({size / 1048576:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
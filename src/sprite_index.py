@@ -0,0 +1,300 @@
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+from logger import logger
+
+# Manifest layout version, bump when the entry format changes
+MANIFEST_VERSION = 1
+
+VARIANTS = ("normal", "shiny")
+
+
+class SpriteInfo:
+    """Location and metadata of one sprite variant"""
+
+    __slots__ = ("path", "generation", "file_size", "mtime_ns",
+                 "frame_count", "durations", "width", "height")
+
+    def __init__(self, path, generation, file_size, mtime_ns):
+        self.path = path
+        self.generation = generation
+        self.file_size = file_size
+        self.mtime_ns = mtime_ns
+        # Filled in by SpriteIndex.load_metadata()
+        self.frame_count = None
+        self.durations = None
+        self.width = None
+        self.height = None
+
+    def to_dict(self):
+        return {
+            "file_size": self.file_size,
+            "mtime_ns": self.mtime_ns,
+            "frame_count": self.frame_count,
+            "durations": self.durations,
+            "width": self.width,
+            "height": self.height,
+        }
+
+
+class SpriteIndex:
+    """Maps (species, shiny) to sprite files, built from one directory scan"""
+
+    def __init__(self, gifs_dir, manifest_path=None, bundle=None):
+        self.gifs_dir = Path(gifs_dir)
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        # Packed sprite bundle, used instead of loose GIFs when present
+        self.bundle = bundle
+        self._sprites = {}
+        self._metadata_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def __contains__(self, key):
+        return key in self._sprites
+
+    def items(self):
+        """Iterate ((species, shiny), SpriteInfo) pairs"""
+        return self._sprites.items()
+
+    def build(self):
+        """Scan assets/gifs/gen*/{normal,shiny} once and index every GIF
+
+        With a bundle, bundled sprites are used except where a loose GIF is
+        missing from the bundle or newer than it, so sprites added or edited
+        since the bundle was built still show up.
+        """
+        sprites = self._scan_gifs()
+        if self.bundle is not None:
+            sprites = self._merge_bundle(sprites)
+        self._sprites = sprites
+        return self
+
+    def _scan_gifs(self):
+        sprites = {}
+        gen_dirs = sorted(
+            (entry for entry in os.scandir(self.gifs_dir) if entry.is_dir() and entry.name.startswith("gen")),
+            key=lambda entry: entry.name
+        ) if self.gifs_dir.is_dir() else []
+
+        for gen_dir in gen_dirs:
+            for variant in VARIANTS:
+                variant_dir = os.path.join(gen_dir.path, variant)
+                if not os.path.isdir(variant_dir):
+                    continue
+                for entry in os.scandir(variant_dir):
+                    name, ext = os.path.splitext(entry.name)
+                    if ext.lower() != ".gif" or not entry.is_file():
+                        continue
+                    key = (name, variant == "shiny")
+                    # Earlier generations win, matching the old directory probing order
+                    if key in sprites:
+                        continue
+                    stat = entry.stat()
+                    sprites[key] = SpriteInfo(Path(entry.path), gen_dir.name, stat.st_size, stat.st_mtime_ns)
+        return sprites
+
+    def _merge_bundle(self, loose):
+        sprites = {}
+        for key, entry in self.bundle.entries.items():
+            # Bundled sprites have no loose file; their metadata ships in the bundle
+            info = SpriteInfo(None, entry.generation, entry.length, None)
+            info.width = entry.width
+            info.height = entry.height
+            info.durations = entry.durations
+            info.frame_count = len(entry.durations)
+            sprites[key] = info
+
+        try:
+            bundle_mtime = self.bundle.bundle_path.stat().st_mtime_ns
+        except OSError:
+            bundle_mtime = None
+        stale = 0
+        for key, info in loose.items():
+            if key not in sprites or (bundle_mtime is not None and info.mtime_ns > bundle_mtime):
+                sprites[key] = info
+                stale += 1
+        if stale:
+            logger.log_error(
+                "Sprite bundle is out of date, using the newer loose GIFs; rebuild it with python src/sprite_bundle.py",
+                bundle=str(self.bundle.bundle_path),
+                newer_gifs=stale
+            )
+        return sprites
+
+    def get(self, pokemon_name, is_shiny=False):
+        """Return the SpriteInfo for a species variant, or None"""
+        return self._sprites.get((pokemon_name, is_shiny))
+
+    def path(self, pokemon_name, is_shiny=False):
+        """Return the GIF path for a species variant, or None"""
+        info = self._sprites.get((pokemon_name, is_shiny))
+        return info.path if info is not None else None
+
+    def source(self, pokemon_name, is_shiny=False):
+        """Return something PIL can open for a species variant (bundle reader or path), or None"""
+        info = self._sprites.get((pokemon_name, is_shiny))
+        if info is None:
+            return None
+        if info.path is None:
+            return self.bundle.open_sprite(pokemon_name, is_shiny)
+        return info.path
+
+    def missing(self, pokemon_names):
+        """List (name, variant) pairs from the roster that have no sprite"""
+        return [
+            (name, variant)
+            for name in pokemon_names
+            for variant in VARIANTS
+            if (name, variant == "shiny") not in self._sprites
+        ]
+
+    def _manifest_key(self, info):
+        return info.path.relative_to(self.gifs_dir).as_posix()
+
+    def _load_manifest(self):
+        if self.manifest_path is None or not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+            if manifest.get("version") != MANIFEST_VERSION:
+                return {}
+            return manifest.get("sprites", {})
+        except (OSError, ValueError) as e:
+            logger.log_error(f"Error reading sprite manifest: {str(e)}")
+            return {}
+
+    def save_manifest(self):
+        """Write sprite metadata to the manifest file (atomically)"""
+        if self.manifest_path is None:
+            return
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "sprites": {
+                self._manifest_key(info): info.to_dict()
+                for info in self._sprites.values()
+                if info.path is not None and info.frame_count is not None
+            },
+        }
+        temp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(manifest, file)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            logger.log_error(f"Error writing sprite manifest: {str(e)}")
+
+    def load_metadata(self):
+        """Fill frame counts, durations and dimensions, reading only GIFs the manifest does not cover"""
+        with self._metadata_lock:
+            manifest = self._load_manifest()
+            changed = False
+
+            # Bundled sprites came with their metadata
+            loose = [info for info in self._sprites.values() if info.path is not None]
+            if not loose:
+                return
+            for info in loose:
+                entry = manifest.get(self._manifest_key(info))
+                if entry and entry["file_size"] == info.file_size and entry["mtime_ns"] == info.mtime_ns:
+                    info.frame_count = entry["frame_count"]
+                    info.durations = entry["durations"]
+                    info.width = entry["width"]
+                    info.height = entry["height"]
+                    continue
+                try:
+                    self._read_metadata(info)
+                    changed = True
+                except Exception as e:
+                    logger.log_error(f"Error reading sprite metadata for {info.path}: {str(e)}")
+
+            if changed or len(manifest) != len(loose):
+                self.save_manifest()
+
+    @staticmethod
+    def _read_metadata(info):
+        width, height, durations = read_gif_metadata(info.path)
+        info.width = width
+        info.height = height
+        info.frame_count = len(durations)
+        info.durations = durations
+
+
+def read_gif_metadata(gif_path):
+    """Read dimensions and per-frame durations (ms) by walking the GIF blocks without decoding"""
+    from sprite_loader import DEFAULT_FRAME_DURATION
+
+    with open(gif_path, "rb") as file:
+        data = file.read()
+    if data[:3] != b"GIF":
+        raise ValueError("not a GIF file")
+
+    width = int.from_bytes(data[6:8], "little")
+    height = int.from_bytes(data[8:10], "little")
+    flags = data[10]
+    pos = 13
+    if flags & 0x80:
+        pos += 3 << ((flags & 0x07) + 1)
+
+    def skip_sub_blocks(pos):
+        while data[pos]:
+            pos += data[pos] + 1
+        return pos + 1
+
+    durations = []
+    delay = 0
+    while pos < len(data):
+        block = data[pos]
+        if block == 0x21:  # Extension
+            if data[pos + 1] == 0xF9:  # Graphic control extension carries the frame delay
+                delay = int.from_bytes(data[pos + 4:pos + 6], "little") * 10
+            pos = skip_sub_blocks(pos + 2)
+        elif block == 0x2C:  # Image descriptor
+            flags = data[pos + 9]
+            pos += 10
+            if flags & 0x80:
+                pos += 3 << ((flags & 0x07) + 1)
+            pos = skip_sub_blocks(pos + 1)
+            durations.append(delay or DEFAULT_FRAME_DURATION)
+        elif block == 0x3B:  # Trailer
+            break
+        else:
+            raise ValueError(f"unexpected GIF block 0x{block:02x}")
+    return width, height, durations
+
+
+def report_missing(sprite_index, pokemon_names):
+    """Log and print roster entries without a sprite"""
+    missing = sprite_index.missing(pokemon_names)
+    for name, variant in missing:
+        logger.log_error(f"Missing {variant} sprite for {name}")
+    if missing:
+        print(f"Warning: {len(missing)} sprites are missing (see logs/error.log)")
+    return missing
+
+
+def main():
+    from config_loader import PROJECT_ROOT, load_config
+    from data_manager import DataManager
+
+    config = load_config()
+    sprite_index = SpriteIndex(PROJECT_ROOT['runtime'] / "assets" / "gifs", config["sprite_manifest_file"]).build()
+    sprite_index.load_metadata()
+    print(f"Indexed {len(sprite_index)} sprites, manifest written to {config['sprite_manifest_file']}")
+
+    pokemon_data = DataManager(config).load_pokemon_data()
+    missing = sprite_index.missing(pokemon_data.keys())
+    for name, variant in missing:
+        print(f"  missing {variant} sprite: {name}")
+    if not missing:
+        print("Every roster entry has a normal and shiny sprite")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
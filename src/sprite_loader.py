@@ -0,0 +1,200 @@
+import argparse
+import sys
+
+from PIL import Image
+
+from asset_cache import source_digest
+from metrics import decode_time
+
+# Frame duration used when a GIF frame does not specify one (ms)
+DEFAULT_FRAME_DURATION = 67
+
+
+class DecodedSprite:
+    """Frames of one sprite, ready to be turned into Tk images
+
+    Frames are cropped to their opaque area: offsets[i] is where frame i's
+    top-left corner sits within the full size x size sprite. Frames with at
+    most 256 colours are kept in palette mode; their RGBA versions are made
+    by display_frames() and kept, so a decode thread can prepare them.
+    """
+
+    def __init__(self, frames, durations, offsets=None, size=None, display=None):
+        self.frames = frames
+        # RGBA frames for display, when the decoder already has them
+        self._display = display
+        self.durations = durations
+        self.offsets = offsets if offsets is not None else [(0, 0)] * len(frames)
+        if size is None:
+            size = (max((frame.width for frame in frames), default=0), max((frame.height for frame in frames), default=0))
+        self.size = tuple(size)
+        # What the Tk images will hold (always RGBA)
+        self.nbytes = sum(frame.width * frame.height * 4 for frame in frames)
+
+    @property
+    def stored_nbytes(self):
+        """Bytes held by the frames themselves (one per pixel in palette mode)"""
+        return sum(frame.width * frame.height * (1 if frame.mode == "P" else 4) for frame in self.frames)
+
+    def display_frames(self):
+        """Frames as RGBA, which is what ImageTk.PhotoImage needs to keep transparency"""
+        if self._display is None:
+            self._display = [frame.convert("RGBA") if frame.mode != "RGBA" else frame for frame in self.frames]
+        return self._display
+
+    def centre_offsets(self):
+        """Offset of each frame's top-left corner from the sprite's centre"""
+        width, height = self.size
+        return [(x - width // 2, y - height // 2) for x, y in self.offsets]
+
+
+def _crop_frame(rgba):
+    """Crop a frame to its opaque area; returns (frame, offset of its top-left corner)"""
+    bbox = rgba.getchannel("A").getbbox()
+    if bbox is None:
+        # Fully transparent frame
+        return rgba.crop((0, 0, 1, 1)), (0, 0)
+    return rgba.crop(bbox), bbox[:2]
+
+
+def _to_palette(rgba, pixels):
+    """rgba as a palette image with an RGBA palette, or rgba itself if it has over 256 colours
+
+    Exact, unlike quantize(): every pixel maps to its own palette entry.
+    """
+    import numpy as np
+
+    found = rgba.getcolors(256)
+    if found is None:
+        return rgba
+    # Pixels read as little-endian uint32 are R | G << 8 | B << 16 | A << 24
+    palette = np.sort(np.array([r | g << 8 | b << 16 | a << 24 for _, (r, g, b, a) in found], dtype="<u4"))
+    indices = np.searchsorted(palette, np.frombuffer(pixels, dtype="<u4")).astype(np.uint8)
+    paletted = Image.frombytes("P", rgba.size, indices.tobytes())
+    paletted.putpalette(palette.tobytes(), rawmode="RGBA")
+    return paletted
+
+
+def decode_gif_frames(gif_path):
+    """Decode every frame of a GIF (path or file object), safe to call off the Tk thread
+
+    Frames are cropped to their opaque area and kept in palette mode when
+    they have at most 256 colours. A frame identical to the one before it
+    is dropped and its duration added to that frame, so a held pose costs
+    one image.
+    """
+    frames = []
+    display = []
+    durations = []
+    offsets = []
+    previous = None
+    with decode_time.time(), Image.open(gif_path) as image:
+        size = image.size
+        for frame in range(0, getattr(image, "n_frames", 1)):
+            image.seek(frame)
+            duration = image.info.get('duration') or DEFAULT_FRAME_DURATION
+            # Convert to RGBA to ensure consistent format
+            cropped, offset = _crop_frame(image.convert('RGBA'))
+            pixels = cropped.tobytes()
+            # Only consecutive frames are compared, so the bytes themselves are cheaper than a hash
+            current = (offset, cropped.size, pixels)
+            if current == previous:
+                durations[-1] += duration
+                continue
+            previous = current
+            frames.append(_to_palette(cropped, pixels))
+            display.append(cropped)
+            offsets.append(offset)
+            durations.append(duration)
+    return DecodedSprite(frames, durations, offsets, size, display)
+
+
+def decode_sprite(source, scale=1.0, cache=None):
+    """Decode a sprite with frames scaled by scale, through the derived-asset cache if given"""
+    # Set when the GIF itself is decoded, whose RGBA frames can be shown as they are at scale 1
+    decoded_gif = None
+
+    def build():
+        nonlocal decoded_gif
+        decoded = decoded_gif = decode_gif_frames(source)
+        frames, offsets, size = decoded.frames, decoded.offsets, decoded.size
+        if scale != 1.0:
+            # Nearest neighbour keeps pixel art sharp (and palette frames in palette mode)
+            frames = [
+                frame.resize((max(1, round(frame.width * scale)), max(1, round(frame.height * scale))),
+                             Image.Resampling.NEAREST)
+                for frame in frames
+            ]
+            offsets = [(round(x * scale), round(y * scale)) for x, y in offsets]
+            size = (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+        return frames, {"durations": decoded.durations, "offsets": offsets, "size": size}
+
+    if cache is None:
+        frames, meta = build()
+    else:
+        frames, meta = cache.derive(source_digest(source), "sprite", {"scale": scale}, build)
+    display = decoded_gif.display_frames() if decoded_gif is not None and scale == 1.0 else None
+    return DecodedSprite(frames, meta["durations"], [tuple(offset) for offset in meta["offsets"]], meta["size"], display)
+
+
+def frame_savings(sprite_index):
+    """Per generation: sprites, frames and bytes before and after collapsing and cropping
+
+    "Before" is what every GIF frame as a full-size RGBA image used to take.
+    """
+    from PIL import UnidentifiedImageError
+
+    report = {}
+    for (_, _), info in sprite_index.items():
+        try:
+            with Image.open(info.path) as image:
+                width, height = image.size
+                frame_count = getattr(image, "n_frames", 1)
+            decoded = decode_gif_frames(info.path)
+        except (OSError, UnidentifiedImageError):
+            continue
+        totals = report.setdefault(info.generation, {
+            "sprites": 0, "frames_before": 0, "frames_after": 0,
+            "bytes_before": 0, "bytes_after": 0, "stored_bytes": 0,
+        })
+        totals["sprites"] += 1
+        totals["frames_before"] += frame_count
+        totals["frames_after"] += len(decoded.frames)
+        totals["bytes_before"] += width * height * 4 * frame_count
+        totals["bytes_after"] += decoded.nbytes
+        totals["stored_bytes"] += decoded.stored_nbytes
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the frame memory saved by collapsing and cropping sprites")
+    parser.parse_args(argv)
+
+    from config_loader import PROJECT_ROOT
+    from sprite_index import SpriteIndex
+
+    report = frame_savings(SpriteIndex(PROJECT_ROOT['runtime'] / "assets" / "gifs").build())
+    if not report:
+        print("No sprites found")
+        return 1
+    print(f"{'':<6} {'sprites':>8} {'frames':>17} {'RGBA MB':>17} {'saved':>7} {'stored MB':>10}")
+    total = {}
+    for generation in sorted(report) + ["total"]:
+        if generation == "total":
+            totals = total
+        else:
+            totals = report[generation]
+            for key, value in totals.items():
+                total[key] = total.get(key, 0) + value
+        saved = 1 - totals["bytes_after"] / totals["bytes_before"] if totals["bytes_before"] else 0.0
+        print(
+            f"{generation:<6} {totals['sprites']:>8,} "
+            f"{totals['frames_before']:>8,}->{totals['frames_after']:<8,} "
+            f"{totals['bytes_before'] / 1048576:>7.1f}->{totals['bytes_after'] / 1048576:<8.1f} "
+            f"{saved:>7.0%} {totals['stored_bytes'] / 1048576:>10.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
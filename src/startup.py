@@ -0,0 +1,36 @@
+import json
+import time
+
+
+class StartupTimer:
+    """Records how long each startup phase took, up to the first rendered frame"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases = []
+
+    def mark(self, phase):
+        """End the current phase and name it"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def total(self):
+        return self._last - self.started
+
+    def report(self):
+        """Print the time spent in each phase"""
+        print("Startup timing:")
+        for phase, seconds in self.phases:
+            print(f"  {phase:<16} {seconds * 1000:>8.1f} ms")
+        print(f"  {'total':<16} {self.total() * 1000:>8.1f} ms")
+
+    def save(self, path):
+        """Write the phase timings (in seconds) as JSON"""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"phases": dict(self.phases), "total": self.total()}, file, indent=2)
+
+
+# Created on first import, so the imports of main itself are included
+startup_timer = StartupTimer()